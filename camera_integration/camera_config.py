@@ -3,13 +3,20 @@
 """
 Configuración y utilidades para sistema de cámaras
 """
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from config.settings import settings
 from utils.logger import log_error
 
+# Marcador de la última limpieza de imágenes (contiene el mtime de la
+# imagen más antigua que sobrevivió a esa limpieza)
+CLEANUP_MARKER = ".last_cleanup"
+
 
 @dataclass
 class CameraQualitySettings:
@@ -66,30 +73,98 @@ class CameraConfigurationManager:
         for directory in directories:
             (self.storage.base_directory / directory).mkdir(parents=True, exist_ok=True)
     
+    def needs_cleanup(self) -> bool:
+        """
+        Determinar si la limpieza de imágenes puede tener trabajo que hacer
+        
+        Se omite cuando, desde la última limpieza, no cambió ningún directorio
+        de imágenes y ninguna imagen restante superó el período de retención.
+        """
+        base_directory = self.storage.base_directory
+        marker = base_directory / CLEANUP_MARKER
+        
+        try:
+            marker_mtime = marker.stat().st_mtime
+            oldest_remaining = float(marker.read_text())
+        except (OSError, ValueError):
+            return True
+        
+        cutoff = time.time() - self.storage.retention_days * 86400
+        if oldest_remaining < cutoff:
+            return True
+        
+        # Las imágenes se guardan en subdirectorios de primer nivel (movements, manual, ...)
+        try:
+            latest_change = base_directory.stat().st_mtime
+            with os.scandir(base_directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        latest_change = max(latest_change, entry.stat().st_mtime)
+        except OSError:
+            return True
+        
+        return latest_change > marker_mtime
+    
     def cleanup_old_images(self) -> int:
         """Limpiar imágenes antiguas según configuración"""
         if not self.storage.auto_cleanup:
             return 0
         
         try:
-            from datetime import datetime, timedelta
-            import os
-            
-            cutoff_date = datetime.now() - timedelta(days=self.storage.retention_days)
-            deleted_count = 0
+            expired, oldest_remaining = self._collect_expired()
+            deleted_count = self._delete_many(expired)
             
-            for root, dirs, files in os.walk(self.storage.base_directory):
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                        filepath = Path(root) / file
-                        file_mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
-                        
-                        if file_mtime < cutoff_date:
-                            filepath.unlink()
-                            deleted_count += 1
+            # Escribir el marcador al final para que su mtime sea posterior
+            # a los cambios de directorio producidos por la propia limpieza
+            (self.storage.base_directory / CLEANUP_MARKER).write_text(repr(oldest_remaining))
             
             return deleted_count
             
         except Exception as e:
             log_error(e, "cleanup_old_images")
             return 0
+    
+    def _collect_expired(self) -> Tuple[List[str], float]:
+        """
+        Recolectar imágenes que superaron el período de retención
+        
+        Returns:
+            Tuple[List[str], float]: (rutas expiradas, mtime de la imagen restante más antigua)
+        """
+        cutoff = time.time() - self.storage.retention_days * 86400
+        expired = []
+        oldest_remaining = float('inf')
+        
+        for root, dirs, files in os.walk(self.storage.base_directory):
+            for file in files:
+                if file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                    filepath = os.path.join(root, file)
+                    file_mtime = os.stat(filepath).st_mtime
+                    
+                    if file_mtime < cutoff:
+                        expired.append(filepath)
+                    else:
+                        oldest_remaining = min(oldest_remaining, file_mtime)
+        
+        return expired, oldest_remaining
+    
+    @staticmethod
+    def _delete_many(paths: List[str]) -> int:
+        """
+        Eliminar archivos en paralelo (solapa la latencia en almacenamiento de red)
+        
+        Returns:
+            int: Número de archivos eliminados
+        """
+        if not paths:
+            return 0
+        
+        def unlink(path: str) -> bool:
+            try:
+                os.unlink(path)
+                return True
+            except FileNotFoundError:
+                return False
+        
+        with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+            return sum(executor.map(unlink, paths))
@@ -11,6 +11,7 @@ import base64
 import json
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any, Callable
@@ -232,7 +233,8 @@ class HikvisionManager:
             return False
     
     def capture_image(self, module_id: int, movement_id: int = None, 
-                     custom_filename: str = None) -> Tuple[bool, Optional[str]]:
+                     custom_filename: str = None,
+                     timeout: Optional[float] = None) -> Tuple[bool, Optional[str]]:
         """
         Capturar imagen desde cámara asociada a módulo
         Equivalente a SnapShotToFile en VB6
@@ -241,6 +243,7 @@ class HikvisionManager:
             module_id: ID del módulo
             movement_id: ID del movimiento (opcional)
             custom_filename: Nombre personalizado del archivo
+            timeout: Timeout de la petición (por defecto el del dispositivo)
             
         Returns:
             Tuple[bool, Optional[str]]: (éxito, ruta_archivo)
@@ -276,7 +279,7 @@ class HikvisionManager:
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
             # Capturar imagen
-            success = self._capture_snapshot(device_config, camera_config.channel, filepath)
+            success = self._capture_snapshot(device_config, camera_config.channel, filepath, timeout)
             
             if success:
                 log_camera(f"Imagen capturada: {filepath}", module_id)
@@ -289,7 +292,8 @@ class HikvisionManager:
             return False, None
     
     def _capture_snapshot(self, device_config: HikvisionDeviceConfig, 
-                         channel: int, filepath: Path) -> bool:
+                         channel: int, filepath: Path,
+                         timeout: Optional[float] = None) -> bool:
         """
         Capturar snapshot desde dispositivo Hikvision
         """
@@ -305,7 +309,7 @@ class HikvisionManager:
             response = self.session.get(
                 url,
                 auth=device_config.auth,
-                timeout=device_config.timeout,
+                timeout=timeout or device_config.timeout,
                 stream=True
             )
             
@@ -452,19 +456,31 @@ class HikvisionManager:
             log_error(e, f"get_device_status(device_id={device_id})")
             return {"status": "error", "error": str(e)}
     
-    def get_system_statistics(self) -> Dict[str, Any]:
+    def get_all_device_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtener el estado de todos los dispositivos en una sola pasada
+        
+        Returns:
+            dict: device_id -> estado (mismo formato que get_device_status)
+        """
+        return {device_id: self.get_device_status(device_id)
+                for device_id in list(self.devices.keys())}
+    
+    def get_system_statistics(self, statuses: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Obtener estadísticas del sistema de cámaras
+        
+        Args:
+            statuses: Estados ya obtenidos con get_all_device_status (opcional)
         """
         try:
-            online_devices = 0
+            if statuses is None:
+                statuses = self.get_all_device_status()
+            
             total_devices = len(self.devices)
             configured_cameras = len(self.module_cameras)
-            
-            for device_id in self.devices.keys():
-                status = self.get_device_status(device_id)
-                if status.get("status") == "online":
-                    online_devices += 1
+            online_devices = sum(1 for status in statuses.values()
+                                 if status.get("status") == "online")
             
             return {
                 "total_devices": total_devices,
@@ -528,29 +544,41 @@ class HikvisionManager:
             log_error(e, f"assign_camera_to_module(module_id={module_id})")
             return False
     
-    def test_all_cameras(self) -> Dict[int, bool]:
+    def test_all_cameras(self, timeout: Optional[float] = None) -> Dict[int, bool]:
         """
         Probar todas las cámaras configuradas
-        """
-        results = {}
         
-        for module_id, camera_config in self.module_cameras.items():
-            try:
-                # Intentar capturar imagen de prueba
-                test_filename = f"test/module_{module_id}_test.jpg"
-                success, _ = self.capture_image(module_id, custom_filename=test_filename)
-                results[module_id] = success
-                
-                if success:
-                    log_system(f"Test OK: Módulo {module_id}", "INFO")
-                else:
-                    log_system(f"Test FAIL: Módulo {module_id}", "WARNING")
-                    
-            except Exception as e:
-                results[module_id] = False
-                log_error(e, f"test_all_cameras(module_id={module_id})")
+        Las pruebas se ejecutan en paralelo para solapar la latencia de red
         
-        return results
+        Args:
+            timeout: Timeout por cámara (por defecto el del dispositivo)
+        """
+        module_ids = list(self.module_cameras.keys())
+        if not module_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(16, len(module_ids))) as executor:
+            results = executor.map(lambda module_id: self._probe_one(module_id, timeout), module_ids)
+            return dict(zip(module_ids, results))
+    
+    def _probe_one(self, module_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Probar una cámara capturando una imagen de prueba
+        """
+        try:
+            test_filename = f"test/module_{module_id}_test.jpg"
+            success, _ = self.capture_image(module_id, custom_filename=test_filename, timeout=timeout)
+            
+            if success:
+                log_system(f"Test OK: Módulo {module_id}", "INFO")
+            else:
+                log_system(f"Test FAIL: Módulo {module_id}", "WARNING")
+            
+            return success
+            
+        except Exception as e:
+            log_error(e, f"test_all_cameras(module_id={module_id})")
+            return False
     
     def cleanup(self):
         """
@@ -98,8 +98,10 @@ class PollingManager:
         self.event_callbacks: Dict[str, List[Callable]] = {
             'movement_detected': [],
             'module_state_changed': [],
+            'serial_state_changed': [],
             'communication_error': [],
-            'novelty_received': []
+            'novelty_received': [],
+            'communication_message': []  # Síncrono: (timestamp, direction, data)
         }
         
         # Task para polling asíncrono
@@ -250,10 +252,16 @@ class PollingManager:
             command_type = self._extract_command_type(command)
             timeout_ms = self.protocol.get_command_timeout(command_type)
             
-            # Enviar comando y esperar respuesta
-            success, response = self.serial_comm.poll_slave(command, timeout_ms)
+            # Enviar comando y esperar respuesta. La E/S serie bloquea hasta el
+            # timeout: se ejecuta en un hilo para no congelar el loop (que con
+            # la interfaz gráfica es el de Qt)
+            self._notify_communication_message("TX", command)
+            success, response = await asyncio.to_thread(
+                self.serial_comm.poll_slave, command, timeout_ms
+            )
             
             if success and response:
+                self._notify_communication_message("RX", response)
                 # Analizar respuesta
                 await self._analyze_response(response, module_status)
             else:
@@ -401,14 +409,16 @@ class PollingManager:
             module_status: Estado del módulo
         """
         try:
-            # Validar acceso
-            access_result = self.movement_manager.validate_identification(
+            # Validar acceso (consultas a la base fuera del loop)
+            access_result = await asyncio.to_thread(
+                self.movement_manager.validate_identification,
                 identification, module_status.module_id
             )
             
             if access_result.allowed:
                 # Crear movimiento en base de datos
-                success, movement_id = self.movement_manager.create_movement(
+                success, movement_id = await asyncio.to_thread(
+                    self.movement_manager.create_movement,
                     identification, module_status.module_id
                 )
                 
@@ -479,13 +489,15 @@ class PollingManager:
             log_system("Reabriendo puerto serie por errores de comunicación", "WARNING")
             
             if self.serial_comm:
-                success = self.serial_comm.reopen_port()
+                success = await asyncio.to_thread(self.serial_comm.reopen_port)
                 if success:
                     self.consecutive_errors = 0
                     self.port_reopen_count += 1
                     log_system("Puerto serie reabierto exitosamente", "INFO")
                 else:
                     log_error(Exception("Error reabriendo puerto"), "_reopen_serial_port")
+                
+                await self._notify_serial_state_change()
             
         except Exception as e:
             log_error(e, "_reopen_serial_port")
@@ -553,6 +565,32 @@ class PollingManager:
         if event_type in self.event_callbacks:
             self.event_callbacks[event_type].append(callback)
     
+    def unsubscribe_from_event(self, event_type: str, callback: Callable):
+        """
+        Cancelar suscripción a eventos del polling
+        
+        Args:
+            event_type: Tipo de evento
+            callback: Función de callback registrada
+        """
+        callbacks = self.event_callbacks.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+    
+    def _notify_communication_message(self, direction: str, message: str):
+        """Notificar trama TX/RX a los observadores (p. ej. ventana de debug)"""
+        callbacks = self.event_callbacks['communication_message']
+        if not callbacks:
+            return
+        
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        data = message.encode('latin-1', errors='replace').hex(' ').upper()
+        for callback in callbacks:
+            try:
+                callback(timestamp, direction, data)
+            except Exception as e:
+                log_error(e, "communication_message_callback")
+    
     async def _notify_movement_detected(self, identification: str, module_status: ModuleStatus, person=None):
         """Notificar movimiento detectado"""
         for callback in self.event_callbacks['movement_detected']:
@@ -569,6 +607,14 @@ class PollingManager:
             except Exception as e:
                 log_error(e, "module_state_change_callback")
     
+    async def _notify_serial_state_change(self):
+        """Notificar cambio de estado del puerto serie"""
+        for callback in self.event_callbacks['serial_state_changed']:
+            try:
+                await callback()
+            except Exception as e:
+                log_error(e, "serial_state_changed_callback")
+    
     def get_module_status(self, address: int) -> Optional[ModuleStatus]:
         """
         Obtener estado actual de un módulo
@@ -201,7 +201,65 @@ class MovementManager:
         except Exception as e:
             log_error(e, f"get_last_movement({person_id})")
             return None
-    
+
+    def get_movement_details(self, movement_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Obtener los datos de un movimiento para mostrarlo (ventanas de imagen)
+
+        Una sola consulta con módulo, identificación y persona asociados.
+
+        Args:
+            movement_id: ID del movimiento
+
+        Returns:
+            dict: Datos del movimiento o None si no existe
+        """
+        try:
+            with self.db.get_session() as session:
+                row = session.query(
+                    Movement.MovimientoID,
+                    Movement.FechaHora,
+                    Movement.ModuloID,
+                    Module.Nombre.label('module_name'),
+                    Identification.Numero,
+                    Person.Apellido,
+                    Person.Nombre.label('person_first_name')
+                ).outerjoin(
+                    Module, Module.ModuloID == Movement.ModuloID
+                ).outerjoin(
+                    Identification,
+                    Identification.IdentificacionID == Movement.IdentificacionID
+                ).outerjoin(
+                    PersonIdentification,
+                    PersonIdentification.IdentificacionID == Movement.IdentificacionID
+                ).outerjoin(
+                    Person, Person.PersonaID == PersonIdentification.PersonaID
+                ).filter(
+                    Movement.MovimientoID == movement_id
+                ).first()
+
+                if row is None:
+                    return None
+
+                # Mismo formato que Person.full_name
+                if row.Apellido and row.person_first_name:
+                    person_name = f"{row.Apellido}, {row.person_first_name}"
+                else:
+                    person_name = row.Apellido or row.person_first_name or "Desconocido"
+
+                return {
+                    'movement_id': row.MovimientoID,
+                    'movement_time': row.FechaHora,
+                    'module_id': row.ModuloID,
+                    'module_name': row.module_name or f"Módulo {row.ModuloID}",
+                    'identification': row.Numero or '--',
+                    'person_name': person_name,
+                }
+
+        except Exception as e:
+            log_error(e, f"get_movement_details({movement_id})")
+            return None
+
     def _validate_antipassback(self, person_id: int, module_id: int, session: Session) -> bool:
         """
         Validar reglas de antipassback
@@ -5,6 +5,7 @@ Punto de entrada principal del sistema WPC
 Equivalente a MdlConnMain.bas en VB6
 """
 import sys
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional
@@ -143,23 +144,13 @@ class WPCApplication:
             if not all([movement_id, module_id]):
                 return
             
-            # Capturar foto automática
-            success, image_path = self.camera_manager.capture_movement_photo(
-                module_id, movement_id, identification
+            # Captura y procesamiento bloquean (red y disco): en un hilo, para
+            # no detener el loop compartido con la interfaz gráfica
+            image_path = await asyncio.to_thread(
+                self._capture_and_process, module_id, movement_id, identification
             )
             
-            if success and image_path and self.image_processor:
-                # Procesar imagen
-                image_path_obj = Path(image_path)
-                
-                # Agregar marca de agua con información
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                watermark_text = f"WPC - {identification} - {timestamp}"
-                self.image_processor.add_watermark(image_path_obj, watermark_text)
-                
-                # Crear thumbnail
-                self.image_processor.create_thumbnail(image_path_obj)
-                
+            if image_path:
                 self.logger.info(f"Imagen capturada para movimiento {movement_id}: {image_path}")
                 
                 # Actualizar datos del evento para la UI
@@ -168,6 +159,40 @@ class WPCApplication:
         except Exception as e:
             log_error(e, f"_on_movement_detected(movement_id={movement_data.get('movement_id')})")
     
+    def _capture_and_process(self, module_id: int, movement_id: int,
+                             identification: str) -> Optional[str]:
+        """
+        Capturar foto del movimiento y procesarla (se ejecuta fuera del loop)
+        
+        Args:
+            module_id: ID del módulo
+            movement_id: ID del movimiento
+            identification: Identificación presentada
+            
+        Returns:
+            Ruta de la imagen procesada o None si no se capturó
+        """
+        # Capturar foto automática
+        success, image_path = self.camera_manager.capture_movement_photo(
+            module_id, movement_id, identification
+        )
+        
+        if not (success and image_path and self.image_processor):
+            return None
+        
+        # Procesar imagen
+        image_path_obj = Path(image_path)
+        
+        # Agregar marca de agua con información
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        watermark_text = f"WPC - {identification} - {timestamp}"
+        self.image_processor.add_watermark(image_path_obj, watermark_text)
+        
+        # Crear thumbnail
+        self.image_processor.create_thumbnail(image_path_obj)
+        
+        return image_path
+    
     def start_gui_mode(self):
         """
         Iniciar modo interfaz gráfica
@@ -182,6 +207,17 @@ class WPCApplication:
             app.setApplicationName("WPC - Windows Park Control")
             app.setApplicationVersion("2.0.0")
             
+            # Un único event loop: asyncio corre sobre el loop de Qt, así la
+            # tarea de polling y los slots async comparten hilo con la UI
+            try:
+                import qasync
+                loop = qasync.QEventLoop(app)
+                asyncio.set_event_loop(loop)
+            except ImportError:
+                loop = None
+                self.logger.warning("qasync no disponible: el polling asíncrono "
+                                    "no se ejecutará con la interfaz gráfica")
+            
             # Crear ventana principal
             main_window = WPCMainWindow(
                 polling_manager=self.polling_manager,
@@ -196,9 +232,23 @@ class WPCApplication:
             self._is_running = True
             
             # Ejecutar loop de la aplicación
-            exit_code = app.exec()
+            if loop is not None:
+                with loop:
+                    # run_forever devuelve el código de salida de app.exec()
+                    exit_code = loop.run_forever()
+                    
+                    # Cerrar con el loop todavía abierto: la tarea de polling
+                    # cancelada necesita el loop para terminar de desarmarse
+                    polling_task = self.polling_manager.polling_task
+                    self.shutdown()
+                    if polling_task is not None:
+                        loop.run_until_complete(
+                            asyncio.gather(polling_task, return_exceptions=True)
+                        )
+            else:
+                exit_code = app.exec()
+                self.shutdown()
             
-            self.shutdown()
             return exit_code
             
         except ImportError as e:
@@ -4,18 +4,41 @@
 Script de mantenimiento para el sistema WPC
 """
 import sys
+import gzip
+import json
+import time
 from pathlib import Path
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
 
 # Agregar directorio raíz al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import text
+
 from config.settings import settings
 from config.database import init_database, db_manager
 from camera_integration.hikvision_manager import HikvisionManager
 from camera_integration.camera_config import CameraConfigurationManager
 from utils.logger import setup_logging, log_system
-from utils.helpers import cleanup_temp_directory, get_system_info, format_file_size
+from utils.helpers import cleanup_temp_directory, get_system_info, format_file_size, has_network_interface
+
+# Backups mayores a este tamaño se comprimen con gzip
+BACKUP_GZIP_THRESHOLD = 64 * 1024
+
+
+@dataclass(slots=True)
+class TaskResult:
+    """Resultado de una tarea de mantenimiento"""
+    success: bool
+    error: Optional[str] = None
+    info: Optional[Dict[str, Any]] = None
+    deleted: int = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario (compatibilidad con consumidores previos)"""
+        return asdict(self)
 
 
 class MaintenanceManager:
@@ -23,6 +46,13 @@ class MaintenanceManager:
     Gestor de tareas de mantenimiento
     """
     
+    # Consultas de conteo compiladas una vez para las tablas esenciales
+    # (COUNT_BIG evita desbordes en tablas con más de 2^31 filas)
+    _COUNT_STMTS = {
+        table: text(f"SELECT COUNT_BIG(*) AS c FROM {table}")
+        for table in ('mvt', 'mdl', 'idn', 'per', 'tck')
+    }
+    
     def __init__(self):
         self.camera_manager = None
         self.camera_config = None
@@ -34,37 +64,48 @@ class MaintenanceManager:
         Returns:
             Dict[str, Any]: Resultados del mantenimiento
         """
+        # Reloj monotónico solo para medir la duración (no sale del proceso)
+        start_ns = time.monotonic_ns()
         results = {
             'start_time': datetime.now().isoformat(),
             'tasks': {},
             'errors': []
         }
         
+        # Los TaskResult se serializan al guardarlos: results sigue siendo un
+        # dict de dicts apto para JSON
+        tasks = results['tasks']
+        
         try:
             log_system("=== Iniciando Mantenimiento Completo ===", "INFO")
             
             # 1. Información del sistema
-            results['tasks']['system_info'] = self._get_system_info()
+            tasks['system_info'] = self._get_system_info().to_dict()
             
             # 2. Limpieza de archivos temporales
-            results['tasks']['cleanup_temp'] = self._cleanup_temporary_files()
+            tasks['cleanup_temp'] = self._cleanup_temporary_files().to_dict()
             
             # 3. Limpieza de imágenes antiguas
-            results['tasks']['cleanup_images'] = self._cleanup_old_images()
+            tasks['cleanup_images'] = self._cleanup_old_images().to_dict()
             
-            # 4. Verificación de base de datos
-            results['tasks']['database_check'] = self._check_database_health()
+            # 4-5. Verificación y optimización de base de datos (una sola sesión)
+            if init_database():
+                with db_manager.get_session() as session:
+                    tasks['database_check'] = self._check_database_health(session).to_dict()
+                    tasks['database_optimization'] = self._optimize_database(session).to_dict()
+            else:
+                db_error = TaskResult(success=False, error='No se pudo conectar a la base de datos')
+                tasks['database_check'] = db_error.to_dict()
+                tasks['database_optimization'] = db_error.to_dict()
             
-            # 5. Verificación de cámaras
-            results['tasks']['camera_check'] = self._check_camera_system()
-            
-            # 6. Optimización de base de datos
-            results['tasks']['database_optimization'] = self._optimize_database()
+            # 6. Verificación de cámaras
+            tasks['camera_check'] = self._check_camera_system().to_dict()
             
             # 7. Backup de configuración
-            results['tasks']['config_backup'] = self._backup_configuration()
+            tasks['config_backup'] = self._backup_configuration().to_dict()
             
             results['end_time'] = datetime.now().isoformat()
+            results['duration_ms'] = (time.monotonic_ns() - start_ns) // 1_000_000
             results['success'] = True
             
             log_system("=== Mantenimiento Completado ===", "INFO")
@@ -76,16 +117,16 @@ class MaintenanceManager:
         
         return results
     
-    def _get_system_info(self) -> Dict[str, Any]:
+    def _get_system_info(self) -> TaskResult:
         """Obtener información del sistema"""
         try:
             info = get_system_info()
             log_system(f"Sistema: {info.get('platform', 'Unknown')}", "INFO")
-            return {'success': True, 'info': info}
+            return TaskResult(success=True, info=info)
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
     
-    def _cleanup_temporary_files(self) -> Dict[str, Any]:
+    def _cleanup_temporary_files(self) -> TaskResult:
         """Limpiar archivos temporales"""
         try:
             temp_dirs = [
@@ -94,6 +135,9 @@ class MaintenanceManager:
                 Path('./temp')
             ]
             
+            # Evitar recorrer dos veces el mismo directorio (TEMP_DIR puede ser ./temp)
+            temp_dirs = list(dict.fromkeys(d.resolve() for d in temp_dirs))
+            
             total_deleted = 0
             
             for temp_dir in temp_dirs:
@@ -102,116 +146,117 @@ class MaintenanceManager:
                     total_deleted += deleted
             
             log_system(f"Archivos temporales eliminados: {total_deleted}", "INFO")
-            return {'success': True, 'files_deleted': total_deleted}
+            return TaskResult(success=True, deleted=total_deleted)
             
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
     
-    def _cleanup_old_images(self) -> Dict[str, Any]:
+    def _cleanup_old_images(self) -> TaskResult:
         """Limpiar imágenes antiguas"""
         try:
             if not self.camera_config:
                 self.camera_config = CameraConfigurationManager()
             
+            # Evitar recorrer el almacén de imágenes si nada cambió desde la última limpieza
+            if not self.camera_config.needs_cleanup():
+                log_system("Sin cambios en imágenes desde la última limpieza", "DEBUG")
+                return TaskResult(success=True, info={'skipped': True})
+            
             deleted_count = self.camera_config.cleanup_old_images()
             log_system(f"Imágenes antiguas eliminadas: {deleted_count}", "INFO")
             
-            return {'success': True, 'images_deleted': deleted_count}
+            return TaskResult(success=True, deleted=deleted_count)
             
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
     
-    def _check_database_health(self) -> Dict[str, Any]:
+    def _check_database_health(self, session) -> TaskResult:
         """Verificar salud de base de datos"""
         try:
-            if not init_database():
-                return {'success': False, 'error': 'No se pudo conectar a la base de datos'}
+            # Verificar tablas principales
+            missing_tables = []
             
-            with db_manager.get_session() as session:
-                # Verificar tablas principales
-                essential_tables = ['mvt', 'mdl', 'idn', 'per', 'tck']
-                missing_tables = []
-                
-                for table in essential_tables:
-                    try:
-                        result = session.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = result.scalar()
-                        log_system(f"Tabla {table}: {count} registros", "DEBUG")
-                    except Exception:
-                        missing_tables.append(table)
-                
-                if missing_tables:
-                    return {
-                        'success': False, 
-                        'error': f'Tablas faltantes: {", ".join(missing_tables)}'
-                    }
-                
-                return {'success': True, 'status': 'healthy'}
+            for table, stmt in self._COUNT_STMTS.items():
+                try:
+                    count = session.execute(stmt).scalar()
+                    log_system(f"Tabla {table}: {count} registros", "DEBUG")
+                except Exception:
+                    missing_tables.append(table)
+            
+            if missing_tables:
+                return TaskResult(
+                    success=False,
+                    error=f'Tablas faltantes: {", ".join(missing_tables)}'
+                )
+            
+            return TaskResult(success=True, info={'status': 'healthy'})
                 
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
     
-    def _check_camera_system(self) -> Dict[str, Any]:
+    def _check_camera_system(self) -> TaskResult:
         """Verificar sistema de cámaras"""
         try:
+            # Evitar esperar timeouts de conexión si no hay red disponible
+            if not has_network_interface():
+                log_system("Sin interfaz de red activa, se omite verificación de cámaras", "WARNING")
+                return TaskResult(success=False, error='no network')
+            
             if not self.camera_manager:
                 self.camera_manager = HikvisionManager()
                 
             if not self.camera_manager.initialize():
-                return {'success': False, 'error': 'No se pudo inicializar sistema de cámaras'}
+                return TaskResult(success=False, error='No se pudo inicializar sistema de cámaras')
             
             # Obtener estadísticas
             stats = self.camera_manager.get_system_statistics()
             
             # Probar cámaras
-            test_results = self.camera_manager.test_all_cameras()
+            test_results = self.camera_manager.test_all_cameras(timeout=2.0)
             working_cameras = sum(1 for result in test_results.values() if result)
             
             log_system(f"Cámaras funcionando: {working_cameras}/{len(test_results)}", "INFO")
             
-            return {
-                'success': True,
+            return TaskResult(success=True, info={
                 'statistics': stats,
                 'test_results': test_results,
                 'working_cameras': working_cameras,
                 'total_cameras': len(test_results)
-            }
+            })
             
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
         finally:
             if self.camera_manager:
                 self.camera_manager.cleanup()
     
-    def _optimize_database(self) -> Dict[str, Any]:
+    def _optimize_database(self, session) -> TaskResult:
         """Optimizar base de datos"""
         try:
-            with db_manager.get_session() as session:
-                # Actualizar estadísticas de tablas principales
-                optimization_queries = [
-                    "UPDATE STATISTICS mvt",
-                    "UPDATE STATISTICS mdl", 
-                    "UPDATE STATISTICS idn",
-                    "UPDATE STATISTICS per"
-                ]
-                
-                for query in optimization_queries:
-                    try:
-                        session.execute(query)
-                        log_system(f"Ejecutado: {query}", "DEBUG")
-                    except Exception as e:
-                        log_system(f"Error en optimización: {query} - {e}", "WARNING")
-                
-                return {'success': True, 'optimizations_run': len(optimization_queries)}
+            # Actualizar estadísticas de tablas principales
+            optimization_queries = [
+                "UPDATE STATISTICS mvt",
+                "UPDATE STATISTICS mdl", 
+                "UPDATE STATISTICS idn",
+                "UPDATE STATISTICS per"
+            ]
+            
+            for query in optimization_queries:
+                try:
+                    session.execute(text(query))
+                    log_system(f"Ejecutado: {query}", "DEBUG")
+                except Exception as e:
+                    log_system(f"Error en optimización: {query} - {e}", "WARNING")
+            
+            return TaskResult(success=True, info={'optimizations_run': len(optimization_queries)})
                 
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
     
-    def _backup_configuration(self) -> Dict[str, Any]:
+    def _backup_configuration(self) -> TaskResult:
         """Crear backup de configuración"""
         try:
             from utils.helpers import create_backup_filename
-            import json
             
             backup_dir = settings.BASE_DIR / 'backups'
             backup_dir.mkdir(exist_ok=True)
@@ -229,19 +274,28 @@ class MaintenanceManager:
             
             config_backup_path = create_backup_filename('config.json', backup_dir)
             
-            with open(config_backup_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            # Formato compacto salvo en modo debug; escritura en una sola llamada
+            if settings.DEBUG_MODE:
+                data = json.dumps(config_data, indent=2).encode('utf-8')
+            else:
+                data = json.dumps(config_data, separators=(',', ':')).encode('utf-8')
+            
+            if len(data) > BACKUP_GZIP_THRESHOLD:
+                config_backup_path = config_backup_path.with_suffix('.json.gz')
+                with gzip.open(config_backup_path, 'wb', compresslevel=1) as f:
+                    f.write(data)
+            else:
+                config_backup_path.write_bytes(data)
             
             log_system(f"Backup de configuración creado: {config_backup_path}", "INFO")
             
-            return {
-                'success': True,
+            return TaskResult(success=True, info={
                 'backup_path': str(config_backup_path),
                 'backup_size': format_file_size(config_backup_path.stat().st_size)
-            }
+            })
             
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return TaskResult(success=False, error=str(e))
 
 
 def main():
@@ -257,20 +311,25 @@ def main():
     maintenance = MaintenanceManager()
     results = maintenance.run_full_maintenance()
     
-    # Mostrar resultados
-    print(f"\nMantenimiento {'EXITOSO' if results['success'] else 'FALLIDO'}")
-    print(f"Inicio: {results['start_time']}")
-    print(f"Fin: {results.get('end_time', 'N/A')}")
-    
-    print("\nResultados por tarea:")
+    # Mostrar resultados (una sola escritura a stdout)
+    out = [
+        f"\nMantenimiento {'EXITOSO' if results['success'] else 'FALLIDO'}",
+        f"Inicio: {results['start_time']}",
+        f"Fin: {results.get('end_time', 'N/A')}",
+        f"Duración: {results.get('duration_ms', 'N/A')} ms",
+        "\nResultados por tarea:"
+    ]
     for task_name, task_result in results['tasks'].items():
         status = "✓" if task_result.get('success', False) else "✗"
-        print(f"  {status} {task_name}: {task_result}")
+        out.append(f"  {status} {task_name}: {task_result}")
     
     if results['errors']:
-        print(f"\nErrores encontrados: {len(results['errors'])}")
+        out.append(f"\nErrores encontrados: {len(results['errors'])}")
         for error in results['errors']:
-            print(f"  - {error}")
+            out.append(f"  - {error}")
+    
+    sys.stdout.write("\n".join(out))
+    sys.stdout.write("\n")
     
     return 0 if results['success'] else 1
 
@@ -3,6 +3,8 @@
 Script para probar el sistema de cámaras
 """
 
+import sys
+
 import pytest
 
 pytest.skip(
@@ -19,7 +21,8 @@ def test_hikvision_system():
     """Script de prueba completo del sistema Hikvision."""
     pytest.skip("Prueba de integración fuera del alcance del entorno de CI")
 
-    print("=== Test Sistema de Cámaras Hikvision ===")
+    # Salida acumulada y emitida en una sola escritura al finalizar
+    out = ["=== Test Sistema de Cámaras Hikvision ==="]
     
     # Inicializar componentes
     camera_manager = HikvisionManager()
@@ -28,59 +31,61 @@ def test_hikvision_system():
     
     try:
         # 1. Inicializar sistema
-        print("\n1. Inicializando sistema...")
+        out.append("\n1. Inicializando sistema...")
         if camera_manager.initialize():
-            print("✓ Sistema inicializado correctamente")
+            out.append("✓ Sistema inicializado correctamente")
         else:
-            print("✗ Error en inicialización")
+            out.append("✗ Error en inicialización")
             return False
         
         # 2. Mostrar estadísticas
-        print("\n2. Estadísticas del sistema:")
+        out.append("\n2. Estadísticas del sistema:")
         stats = camera_manager.get_system_statistics()
         for key, value in stats.items():
-            print(f"   {key}: {value}")
+            out.append(f"   {key}: {value}")
         
         # 3. Probar captura de imágenes
-        print("\n3. Probando captura de imágenes:")
+        out.append("\n3. Probando captura de imágenes:")
         test_results = camera_manager.test_all_cameras()
         
         for module_id, success in test_results.items():
             status = "✓ OK" if success else "✗ FAIL"
-            print(f"   Módulo {module_id}: {status}")
+            out.append(f"   Módulo {module_id}: {status}")
         
         # 4. Test de procesamiento de imágenes
-        print("\n4. Test de procesamiento:")
+        out.append("\n4. Test de procesamiento:")
         test_image_path = config_manager.storage.base_directory / "test/sample.jpg"
         
         if test_image_path.exists():
             # Crear thumbnail
             thumb_path = image_processor.create_thumbnail(test_image_path)
             if thumb_path:
-                print("   ✓ Thumbnail creado")
+                out.append("   ✓ Thumbnail creado")
             
             # Agregar marca de agua
             if image_processor.add_watermark(test_image_path, "WPC Test"):
-                print("   ✓ Marca de agua agregada")
+                out.append("   ✓ Marca de agua agregada")
             
             # Mejorar imagen
             if image_processor.enhance_image(test_image_path):
-                print("   ✓ Imagen mejorada")
+                out.append("   ✓ Imagen mejorada")
         
         # 5. Limpieza
-        print("\n5. Limpieza:")
+        out.append("\n5. Limpieza:")
         deleted_count = config_manager.cleanup_old_images()
-        print(f"   {deleted_count} archivos antiguos eliminados")
+        out.append(f"   {deleted_count} archivos antiguos eliminados")
         
-        print("\n=== Test completado exitosamente ===")
+        out.append("\n=== Test completado exitosamente ===")
         return True
         
     except Exception as e:
-        print(f"\n✗ Error durante test: {e}")
+        out.append(f"\n✗ Error durante test: {e}")
         return False
     
     finally:
         camera_manager.cleanup()
+        sys.stdout.write("\n".join(out))
+        sys.stdout.write("\n")
 
 if __name__ == "__main__":
     # Configurar logging para test
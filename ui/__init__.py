@@ -3,17 +3,46 @@
 Módulo de interfaz gráfica WPC Python
 Equivalente a los formularios VB6 del sistema original
 """
+import importlib
+from functools import lru_cache
+from pathlib import Path
+
+# Importaciones principales (carga diferida, PEP 562): las ventanas y widgets
+# solo se importan al acceder al atributo, evitando cargar PyQt6 con `import ui`
+_LAZY_IMPORTS = {
+    'WPCMainWindow': 'ui.main_window',
+    'ModuleWidget': 'ui.main_window',
+    'SystemStatusWidget': 'ui.main_window',
+    'EventLogWidget': 'ui.main_window',
+    'CommunicationDebugWindow': 'ui.debug_window',
+    'CommandTester': 'ui.debug_window',
+    'CommunicationMonitor': 'ui.debug_window',
+    'WPCImageWindow': 'ui.image_window',
+    'ImageDisplayWidget': 'ui.image_window',
+    'create_image_window': 'ui.image_window',
+    'StatusLED': 'ui.widgets',
+    'ConnectionStatusWidget': 'ui.widgets',
+    'ModuleStatusTable': 'ui.widgets',
+    'EventLogViewer': 'ui.widgets',
+    'ConfigurationDialog': 'ui.widgets',
+    'ProgressIndicator': 'ui.widgets',
+    'StatisticsWidget': 'ui.widgets',
+    'create_module_status_widget': 'ui.widgets',
+    'create_connection_status_panel': 'ui.widgets',
+    'show_configuration_dialog': 'ui.widgets',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-# Importaciones principales
-from .main_window import WPCMainWindow, ModuleWidget, SystemStatusWidget, EventLogWidget
-from .debug_window import CommunicationDebugWindow, CommandTester, CommunicationMonitor
-from .image_window import WPCImageWindow, ImageDisplayWidget, create_image_window
-from .widgets import (
-    StatusLED, ConnectionStatusWidget, ModuleStatusTable, EventLogViewer,
-    ConfigurationDialog, ProgressIndicator, StatisticsWidget,
-    create_module_status_widget, create_connection_status_panel,
-    show_configuration_dialog
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 # Información del módulo
 __version__ = "2.0.0"
@@ -46,101 +75,18 @@ DEFAULT_WINDOW_CONFIG = {
     }
 }
 
-# Estilos CSS globales para la aplicación
-GLOBAL_STYLES = """
-/* Estilo base para la aplicación WPC */
-QMainWindow {
-    background-color: #f0f0f0;
-}
-
-QGroupBox {
-    font-weight: bold;
-    border: 2px solid #cccccc;
-    border-radius: 5px;
-    margin-top: 1ex;
-    padding-top: 10px;
-}
-
-QGroupBox::title {
-    subcontrol-origin: margin;
-    left: 10px;
-    padding: 0 5px 0 5px;
-}
-
-QPushButton {
-    background-color: #e1e1e1;
-    border: 1px solid #999999;
-    border-radius: 3px;
-    padding: 5px 15px;
-    min-width: 80px;
-}
-
-QPushButton:hover {
-    background-color: #e8e8e8;
-    border-color: #0078d4;
-}
-
-QPushButton:pressed {
-    background-color: #d0d0d0;
-}
-
-QPushButton:disabled {
-    background-color: #f0f0f0;
-    color: #999999;
-    border-color: #cccccc;
-}
-
-QStatusBar {
-    background-color: #e0e0e0;
-    border-top: 1px solid #cccccc;
-}
-
-QTextEdit {
-    border: 1px solid #cccccc;
-    border-radius: 3px;
-    background-color: white;
-}
-
-QLineEdit {
-    border: 1px solid #cccccc;
-    border-radius: 3px;
-    padding: 3px;
-    background-color: white;
-}
-
-QLineEdit:focus {
-    border-color: #0078d4;
-}
-
-QComboBox {
-    border: 1px solid #cccccc;
-    border-radius: 3px;
-    padding: 3px;
-    background-color: white;
-}
-
-QTableWidget {
-    gridline-color: #e0e0e0;
-    background-color: white;
-    alternate-background-color: #f8f8f8;
-}
-
-QTableWidget::item:selected {
-    background-color: #0078d4;
-    color: white;
-}
-
-QListWidget {
-    border: 1px solid #cccccc;
-    background-color: white;
-    alternate-background-color: #f8f8f8;
-}
+# Hoja de estilos global de la aplicación (ui/resources/wpc.qss)
+GLOBAL_STYLES_PATH = Path(__file__).parent / "resources" / "wpc.qss"
 
-QListWidget::item:selected {
-    background-color: #0078d4;
-    color: white;
-}
-"""
+@lru_cache(maxsize=1)
+def load_global_styles() -> str:
+    """
+    Leer la hoja de estilos global (una sola vez por proceso)
+    
+    Returns:
+        str: Contenido de la hoja de estilos
+    """
+    return GLOBAL_STYLES_PATH.read_bytes().decode("utf-8")
 
 def apply_global_styles(app):
     """
@@ -149,7 +95,16 @@ def apply_global_styles(app):
     Args:
         app: Instancia de QApplication
     """
-    app.setStyleSheet(GLOBAL_STYLES)
+    # Idempotente: evitar que Qt vuelva a parsear la hoja de estilos
+    if app.styleSheet():
+        return
+    app.setStyleSheet(load_global_styles())
+
+@lru_cache(maxsize=1)
+def _wpc_icon():
+    """Icono de la aplicación (cargado desde disco una sola vez)"""
+    from PyQt6.QtGui import QIcon
+    return QIcon("resources/wpc_icon.ico")
 
 def create_main_application():
     """
@@ -161,7 +116,11 @@ def create_main_application():
     import sys
     from PyQt6.QtWidgets import QApplication
     from PyQt6.QtCore import Qt
-    from PyQt6.QtGui import QIcon
+    from .main_window import WPCMainWindow
+    
+    # Configurar atributos de alta resolución (deben fijarse antes de crear la aplicación)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
     
     # Crear aplicación
     app = QApplication(sys.argv)
@@ -172,16 +131,12 @@ def create_main_application():
     # Aplicar estilos globales
     apply_global_styles(app)
     
-    # Configurar atributos de alta resolución
-    app.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-    app.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
-    
     # Crear ventana principal
     main_window = WPCMainWindow()
     
     # Configurar icono si existe
     try:
-        icon = QIcon("resources/wpc_icon.ico")
+        icon = _wpc_icon()
         app.setWindowIcon(icon)
         main_window.setWindowIcon(icon)
     except:
@@ -196,11 +151,13 @@ def show_debug_window_standalone():
     """
     import sys
     from PyQt6.QtWidgets import QApplication
+    from .debug_window import CommunicationDebugWindow
     
     app = QApplication(sys.argv)
     apply_global_styles(app)
     
     debug_window = CommunicationDebugWindow()
+    debug_window.setWindowIcon(_wpc_icon())
     debug_window.show()
     
     return app.exec()
@@ -214,11 +171,13 @@ def show_image_window_standalone(window_type: int = 1):
     """
     import sys
     from PyQt6.QtWidgets import QApplication
+    from .image_window import WPCImageWindow
     
     app = QApplication(sys.argv)
     apply_global_styles(app)
     
     image_window = WPCImageWindow(window_type)
+    image_window.setWindowIcon(_wpc_icon())
     image_window.show()
     
     return app.exec()
@@ -230,6 +189,10 @@ def get_available_windows():
     Returns:
         Dict con información de ventanas disponibles
     """
+    from .main_window import WPCMainWindow
+    from .debug_window import CommunicationDebugWindow
+    from .image_window import WPCImageWindow
+    
     return {
         "main": {
             "class": WPCMainWindow,
@@ -309,6 +272,9 @@ def test_all_windows():
     """
     import sys
     from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton
+    from .main_window import WPCMainWindow
+    from .debug_window import CommunicationDebugWindow
+    from .image_window import WPCImageWindow
     
     app = QApplication(sys.argv)
     apply_global_styles(app)
@@ -344,6 +310,7 @@ def test_widgets():
     """Probar widgets individuales"""
     from PyQt6.QtWidgets import QWidget, QVBoxLayout
     from datetime import datetime
+    from .widgets import EventLogViewer, create_connection_status_panel
     
     # Crear ventana de prueba de widgets
     widget_test = QWidget()
@@ -368,6 +335,47 @@ def test_widgets():
     
     widget_test.show()
 
+def check_ui_deps():
+    """
+    Registrar la inicialización del módulo UI y validar sus dependencias
+    
+    Returns:
+        Tupla (success, missing_dependencies)
+    """
+    success, missing = validate_ui_dependencies()
+    
+    try:
+        from utils.logger import log_system
+        log_system("Módulo UI inicializado correctamente")
+        
+        if success:
+            log_system("Todas las dependencias de UI están disponibles")
+        else:
+            log_system(f"Dependencias faltantes: {missing}")
+            
+    except ImportError:
+        print("Módulo UI inicializado (logger no disponible)")
+    
+    return success, missing
+
+def print_banner():
+    """Mostrar mensaje de estado del módulo UI"""
+    print(f"""
+🎮 MÓDULO UI WPC PYTHON v{__version__}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✅ Ventanas implementadas: {COMPATIBILITY_INFO['converted_forms']}/{COMPATIBILITY_INFO['total_vb6_forms']}
+✅ Compatibilidad VB6: {COMPATIBILITY_INFO['conversion_percentage']}%
+
+📋 Equivalencias:
+   CACommMain.frm  → WPCMainWindow
+   ViewComm.frm    → CommunicationDebugWindow  
+   FrmImg.frm      → WPCImageWindow
+
+🚀 Para probar: python -m ui.test_all_windows
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+""")
+
 # Exportar símbolos principales
 __all__ = [
     # Ventanas principales
@@ -405,37 +413,7 @@ __all__ = [
     
     # Validación
     'validate_ui_dependencies',
+    'check_ui_deps',
+    'print_banner',
     'get_available_windows'
 ]
-
-# Log de inicialización del módulo
-try:
-    from utils.logger import log_system
-    log_system("Módulo UI inicializado correctamente")
-    
-    # Validar dependencias
-    success, missing = validate_ui_dependencies()
-    if success:
-        log_system("Todas las dependencias de UI están disponibles")
-    else:
-        log_system(f"Dependencias faltantes: {missing}")
-        
-except ImportError:
-    print("Módulo UI inicializado (logger no disponible)")
-
-# Mensaje de estado
-print(f"""
-🎮 MÓDULO UI WPC PYTHON v{__version__}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✅ Ventanas implementadas: {COMPATIBILITY_INFO['converted_forms']}/{COMPATIBILITY_INFO['total_vb6_forms']}
-✅ Compatibilidad VB6: {COMPATIBILITY_INFO['conversion_percentage']}%
-
-📋 Equivalencias:
-   CACommMain.frm  → WPCMainWindow
-   ViewComm.frm    → CommunicationDebugWindow  
-   FrmImg.frm      → WPCImageWindow
-
-🚀 Para probar: python -m ui.test_all_windows
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-""")
\ No newline at end of file
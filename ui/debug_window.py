@@ -3,43 +3,106 @@
 Ventana de debug de comunicación
 Equivalente a ViewComm.frm en VB6
 """
-from typing import Optional
+import time
+from collections import deque, namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Union
 from datetime import datetime
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, 
+    QDialog, QVBoxLayout, QHBoxLayout, QTextEdit, QPlainTextEdit, QPushButton, 
     QCheckBox, QLabel, QGroupBox, QSpinBox, QComboBox, QLineEdit,
     QSplitter, QFrame, QGridLayout, QTabWidget, QWidget, QScrollArea
 )
-from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QThread
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QObject
 from PyQt6.QtGui import QFont, QTextCursor, QColor, QPalette
 
 from core.communication.polling import PollingManager
 from core.communication.protocol import ProtocolHandler
 from utils.logger import log_error
 
-class CommunicationMonitor(QThread):
+# Entrada del buffer de mensajes de comunicación
+MessageEntry = namedtuple('MessageEntry', 'ts direction data')
+
+# Nombres de comandos del protocolo indexados por los 2 bytes del comando
+_CMD_NAMES = MappingProxyType({
+    b"S0": "Leer Estado",
+    b"K1": "Continuar Secuencia",
+    b"K0": "Parar Secuencia",
+    b"T0": "Sincronizar Hora",
+    b"O1": "OK Download Novedad"
+})
+
+@lru_cache(maxsize=1)
+def _format_second(second: int) -> str:
+    """Formatear un segundo epoch como HH:MM:SS (cacheado dentro del mismo segundo)"""
+    return time.strftime("%H:%M:%S", time.localtime(second))
+
+def _ts() -> str:
+    """Hora actual para el log de comunicación"""
+    return _format_second(int(time.time()))
+
+# Opciones del filtro por dirección (una sola inserción en el combo)
+_ADDRESS_FILTER_ITEMS = ["Todas"] + [f"Dirección {i}" for i in range(1, 100)]
+
+# Apertura HTML precalculada por tipo de mensaje
+_MESSAGE_PREFIXES = MappingProxyType({
+    "TX": '<span style="color: #00ff00;">',       # Verde para comandos enviados
+    "RX": '<span style="color: #00aaff;">',       # Azul para respuestas recibidas
+    "ERROR": '<span style="color: #ff4444;">',    # Rojo para errores
+    "INFO": '<span style="color: #ffffff;">',     # Blanco para información
+    "WARNING": '<span style="color: #ffaa00;">'   # Naranja para advertencias
+})
+_DEFAULT_MESSAGE_PREFIX = _MESSAGE_PREFIXES["INFO"]
+
+@lru_cache(maxsize=1024)
+def _interpret_header(header: bytes) -> str:
+    """
+    Interpretar la cabecera de una trama: STX + dirección (2 dígitos ASCII) + comando
+    
+    El polling repite las mismas cabeceras, por eso el resultado se cachea
+    """
+    if len(header) < 5 or header[0] != ProtocolHandler.ASCII_STX:
+        return ""
+    
+    try:
+        address = int(header[1:3])
+    except ValueError:
+        return ""
+    
+    command = header[3:5]
+    cmd_name = _CMD_NAMES.get(command) or f"Comando {command.decode('latin-1')}"
+    return f"Dir:{address} {cmd_name}"
+
+class CommunicationMonitor(QObject):
     """
-    Hilo separado para monitorear comunicación sin bloquear UI
+    Puente entre los eventos de comunicación del polling y la UI
+    
+    La señal se emite desde el hilo del polling y Qt la entrega encolada
+    en el hilo de la UI, sin hilos ni esperas adicionales.
     """
     message_received = pyqtSignal(str, str, str)  # timestamp, direction, data
     
     def __init__(self, polling_manager: PollingManager):
         super().__init__()
         self.polling_manager = polling_manager
-        self.is_monitoring = True
-        self.message_buffer = []
-        
-    def run(self):
-        """Loop principal de monitoreo"""
-        while self.is_monitoring:
-            # Aquí interceptaríamos los mensajes de comunicación
-            # En la implementación real se conectaría con eventos del polling
-            self.msleep(100)
+        self.is_monitoring = False
+    
+    def start(self):
+        """Iniciar monitoreo"""
+        if not self.is_monitoring:
+            self.polling_manager.subscribe_to_event('communication_message', self._on_message)
+            self.is_monitoring = True
     
     def stop_monitoring(self):
         """Detener monitoreo"""
-        self.is_monitoring = False
-        self.wait()
+        if self.is_monitoring:
+            self.polling_manager.unsubscribe_from_event('communication_message', self._on_message)
+            self.is_monitoring = False
+    
+    def _on_message(self, timestamp: str, direction: str, data: str):
+        """Reenviar mensaje del polling como señal Qt"""
+        self.message_received.emit(timestamp, direction, data)
 
 class CommandTester(QGroupBox):
     """
@@ -47,9 +110,9 @@ class CommandTester(QGroupBox):
     """
     command_sent = pyqtSignal(str, str)  # address, command
     
-    def __init__(self):
+    def __init__(self, protocol: Optional[ProtocolHandler] = None):
         super().__init__("Prueba de Comandos")
-        self.protocol = ProtocolHandler()
+        self.protocol = protocol or ProtocolHandler()
         self.setup_ui()
     
     def setup_ui(self):
@@ -66,14 +129,18 @@ class CommandTester(QGroupBox):
         # Tipo de comando
         layout.addWidget(QLabel("Comando:"), 1, 0)
         self.command_combo = QComboBox()
-        self.command_combo.addItems([
-            "S0 - Leer Estado",
-            "K1 - Continuar Secuencia", 
-            "K0 - Parar Secuencia",
-            "T0 - Sincronizar Hora",
-            "O1 - OK Download Novedad",
-            "Personalizado"
-        ])
+        
+        # Tabla (etiqueta, constructor) indexada por posición en el combo;
+        # None corresponde al comando personalizado
+        self._cmd_handlers = [
+            ("S0 - Leer Estado", self.protocol.read_status),
+            ("K1 - Continuar Secuencia", self.protocol.continue_sequence),
+            ("K0 - Parar Secuencia", self.protocol.stop_sequence),
+            ("T0 - Sincronizar Hora", self.protocol.set_time),
+            ("O1 - OK Download Novedad", self.protocol.ok_download_novelty),
+            ("Personalizado", None)
+        ]
+        self.command_combo.addItems([label for label, _ in self._cmd_handlers])
         layout.addWidget(self.command_combo, 1, 1)
         
         # Comando personalizado
@@ -82,9 +149,6 @@ class CommandTester(QGroupBox):
         self.custom_command.setEnabled(False)
         layout.addWidget(self.custom_command, 2, 1)
         
-        # Conectar evento de cambio
-        self.command_combo.currentTextChanged.connect(self.on_command_changed)
-        
         # Botón enviar
         self.send_button = QPushButton("Enviar Comando")
         self.send_button.clicked.connect(self.send_command)
@@ -100,45 +164,48 @@ class CommandTester(QGroupBox):
         # Actualizar comando inicial
         self.update_generated_command()
         
+        # Debounce: regenerar el comando 100 ms después del último cambio
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(100)
+        self._debounce.timeout.connect(self.update_generated_command)
+        
         # Conectar eventos para actualización automática
-        self.address_spin.valueChanged.connect(self.update_generated_command)
-        self.command_combo.currentIndexChanged.connect(self.update_generated_command)
-        self.custom_command.textChanged.connect(self.update_generated_command)
+        self.address_spin.valueChanged.connect(self._schedule_update)
+        self.command_combo.currentTextChanged.connect(self.on_command_changed)
+        self.custom_command.textChanged.connect(self._schedule_update)
+    
+    def _schedule_update(self, *args):
+        """Reiniciar la cuenta del debounce (descarta los argumentos de la señal)"""
+        self._debounce.start()
     
     def on_command_changed(self, text: str):
         """Manejar cambio de tipo de comando"""
         is_custom = "Personalizado" in text
         self.custom_command.setEnabled(is_custom)
-        self.update_generated_command()
+        self._schedule_update()
     
     def update_generated_command(self):
         """Actualizar comando generado"""
         try:
             address = self.address_spin.value()
-            command_text = self.command_combo.currentText()
+            index = self.command_combo.currentIndex()
+            if index < 0:
+                return
+            _, builder = self._cmd_handlers[index]
             
-            if "Personalizado" in command_text:
+            if builder is None:
                 custom = self.custom_command.text().upper()
                 if custom:
                     command = self.protocol._build_command(address, custom)
                 else:
                     command = ""
-            elif "S0 - Leer Estado" in command_text:
-                command = self.protocol.read_status(address)
-            elif "K1 - Continuar" in command_text:
-                command = self.protocol.continue_sequence(address)
-            elif "K0 - Parar" in command_text:
-                command = self.protocol.stop_sequence(address)
-            elif "T0 - Sincronizar" in command_text:
-                command = self.protocol.set_time(address)
-            elif "O1 - OK Download" in command_text:
-                command = self.protocol.ok_download_novelty(address)
             else:
-                command = ""
+                command = builder(address)
             
             # Mostrar comando en formato legible
             if command:
-                hex_command = " ".join(f"{ord(c):02X}" for c in command)
+                hex_command = command.encode('latin-1').hex(' ').upper()
                 self.generated_command.setText(hex_command)
             else:
                 self.generated_command.setText("")
@@ -149,6 +216,11 @@ class CommandTester(QGroupBox):
     def send_command(self):
         """Enviar comando"""
         try:
+            # Aplicar un cambio pendiente del debounce antes de enviar
+            if self._debounce.isActive():
+                self._debounce.stop()
+                self.update_generated_command()
+            
             address = self.address_spin.value()
             command = self.generated_command.text()
             
@@ -172,9 +244,14 @@ class CommunicationDebugWindow(QDialog):
         self.max_lines = 500
         self.auto_scroll = True
         self.is_monitoring = True
-        self.line_count = 0
         
-        # Monitor de comunicación en hilo separado
+        # Buffer de mensajes (fuente de verdad del log; descarta los más antiguos)
+        self.message_buffer = deque(maxlen=self.max_lines)
+        
+        # Mensajes formateados pendientes de volcar al log (ver _flush_log)
+        self._pending = deque(maxlen=self.max_lines)
+        
+        # Monitor de comunicación (eventos del polling)
         self.comm_monitor = None
         if polling_manager:
             self.comm_monitor = CommunicationMonitor(polling_manager)
@@ -251,14 +328,17 @@ class CommunicationDebugWindow(QDialog):
         panel = QGroupBox("Log de Comunicación")
         layout = QVBoxLayout(panel)
         
-        # Área de texto para el log
-        self.comm_log = QTextEdit()
+        # Área de texto para el log (QPlainTextEdit descarta las líneas
+        # más antiguas al superar el máximo de bloques)
+        self.comm_log = QPlainTextEdit()
         self.comm_log.setReadOnly(True)
+        self.comm_log.setUndoRedoEnabled(False)
+        self.comm_log.setMaximumBlockCount(self.max_lines)
         self.comm_log.setFont(QFont("Consolas", 9))
         
         # Estilo oscuro para el log
         self.comm_log.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #ffffff;
                 border: 1px solid #555555;
@@ -268,6 +348,11 @@ class CommunicationDebugWindow(QDialog):
         
         layout.addWidget(self.comm_log)
         
+        # Seguimiento del final del log (ver _on_log_scrolled)
+        self._follow_tail = True
+        self._flushing = False
+        self.comm_log.verticalScrollBar().valueChanged.connect(self._on_log_scrolled)
+        
         # Controles del log
         log_controls = QHBoxLayout()
         
@@ -294,20 +379,48 @@ class CommunicationDebugWindow(QDialog):
         tabs = QTabWidget()
         
         # Tab 1: Prueba de comandos
-        command_tester = CommandTester()
+        command_tester = CommandTester(self.protocol)
         command_tester.command_sent.connect(self.send_manual_command)
         tabs.addTab(command_tester, "Comandos")
         
-        # Tab 2: Estadísticas
-        stats_widget = self.create_statistics_widget()
-        tabs.addTab(stats_widget, "Estadísticas")
-        
-        # Tab 3: Filtros
-        filters_widget = self.create_filters_widget()
-        tabs.addTab(filters_widget, "Filtros")
+        # Tabs 2 y 3: Estadísticas y Filtros se construyen al activarlos
+        # por primera vez (ver _ensure_tab)
+        self._stats_tab = None
+        self._filters_tab = None
+        self._lazy_tabs = {
+            tabs.addTab(self._create_tab_placeholder(), "Estadísticas"): self.create_statistics_widget,
+            tabs.addTab(self._create_tab_placeholder(), "Filtros"): self.create_filters_widget
+        }
+        tabs.currentChanged.connect(self._ensure_tab)
         
+        self.tools_tabs = tabs
         return tabs
     
+    @staticmethod
+    def _create_tab_placeholder() -> QWidget:
+        """Crear contenedor vacío para un tab de construcción diferida"""
+        placeholder = QWidget()
+        layout = QVBoxLayout(placeholder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        return placeholder
+    
+    def _ensure_tab(self, index: int):
+        """Construir el contenido de un tab diferido al activarlo por primera vez"""
+        factory = self._lazy_tabs.pop(index, None)
+        if factory is not None:
+            content = factory()
+            self.tools_tabs.widget(index).layout().addWidget(content)
+            
+            if factory == self.create_statistics_widget:
+                self._stats_tab = self.tools_tabs.widget(index)
+                self.stats_timer.start(5000)  # Cada 5 segundos
+            else:
+                self._filters_tab = self.tools_tabs.widget(index)
+        
+        # Actualizar estadísticas al mostrar su tab
+        if self._stats_tab is not None and self.tools_tabs.widget(index) is self._stats_tab:
+            self.update_statistics()
+    
     def create_statistics_widget(self) -> QWidget:
         """Crear widget de estadísticas"""
         widget = QWidget()
@@ -333,8 +446,10 @@ class CommunicationDebugWindow(QDialog):
         module_stats_group = QGroupBox("Estado por Módulo")
         module_layout = QVBoxLayout(module_stats_group)
         
+        self._last_module_stats = None
         self.module_stats_text = QTextEdit()
         self.module_stats_text.setReadOnly(True)
+        self.module_stats_text.setUndoRedoEnabled(False)
         self.module_stats_text.setMaximumHeight(200)
         self.module_stats_text.setFont(QFont("Consolas", 9))
         module_layout.addWidget(self.module_stats_text)
@@ -373,12 +488,15 @@ class CommunicationDebugWindow(QDialog):
         self.show_info_checkbox.setChecked(True)
         filters_layout.addWidget(self.show_info_checkbox, 1, 1)
         
+        # Re-renderizar el log desde el buffer al cambiar filtros
+        for checkbox in (self.show_tx_checkbox, self.show_rx_checkbox,
+                         self.show_errors_checkbox, self.show_info_checkbox):
+            checkbox.toggled.connect(self._rerender)
+        
         # Filtro por dirección
         filters_layout.addWidget(QLabel("Filtrar por dirección:"), 2, 0)
         self.address_filter = QComboBox()
-        self.address_filter.addItem("Todas")
-        for i in range(1, 100):
-            self.address_filter.addItem(f"Dirección {i}")
+        self.address_filter.addItems(_ADDRESS_FILTER_ITEMS)
         filters_layout.addWidget(self.address_filter, 2, 1)
         
         layout.addWidget(filters_group)
@@ -411,10 +529,15 @@ class CommunicationDebugWindow(QDialog):
     
     def setup_monitoring(self):
         """Configurar monitoreo de comunicación"""
-        # Timer para actualizar estadísticas periódicamente
+        # Timer para actualizar estadísticas periódicamente (se inicia al
+        # construir el tab de estadísticas)
         self.stats_timer = QTimer()
         self.stats_timer.timeout.connect(self.update_statistics)
-        self.stats_timer.start(5000)  # Cada 5 segundos
+        
+        # Timer para volcar los mensajes pendientes al log en lotes
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._flush_log)
+        self._flush_timer.start(50)
         
         # Inicializar contadores
         self.tx_count = 0
@@ -437,29 +560,12 @@ class CommunicationDebugWindow(QDialog):
         if not self.is_monitoring:
             return
         
-        # Verificar filtros
-        if not self.should_show_message(direction):
-            return
-        
-        # Verificar límite de líneas (equivalente a nLines = 30 en VB6)
-        if self.line_count >= self.max_lines:
-            self.clear_log()
+        self.message_buffer.append(MessageEntry(timestamp, direction, data))
         
-        # Formatear mensaje según el tipo
-        color = self.get_message_color(direction)
-        formatted_message = self.format_message(timestamp, direction, data, color)
-        
-        # Agregar al log
-        self.comm_log.append(formatted_message)
-        self.line_count += 1
-        
-        # Auto-scroll si está habilitado
-        if self.auto_scroll:
-            scrollbar = self.comm_log.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
-        
-        # Actualizar contador
-        self.line_counter.setText(f"Líneas: {self.line_count}")
+        # Verificar filtros y encolar para el próximo volcado al log; con la
+        # ventana oculta no se formatea (showEvent reconstruye desde el buffer)
+        if (self.isVisible() or direction == "ERROR") and self.should_show_message(direction):
+            self._pending.append(self.format_message(timestamp, direction, data))
         
         # Actualizar contadores por tipo
         if direction == "TX":
@@ -469,8 +575,62 @@ class CommunicationDebugWindow(QDialog):
         elif direction == "ERROR":
             self.error_count += 1
     
+    def _flush_log(self):
+        """
+        Volcar los mensajes pendientes al log en una sola edición
+        
+        El límite de líneas lo aplica setMaximumBlockCount (equivalente a
+        nLines = 30 en VB6)
+        """
+        if not self._pending or not self.comm_log.isVisible():
+            return
+        
+        self._flushing = True
+        try:
+            document = self.comm_log.document()
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.beginEditBlock()
+            for message in self._pending:
+                if not document.isEmpty():
+                    cursor.insertBlock()
+                cursor.insertHtml(message)
+            cursor.endEditBlock()
+            self._pending.clear()
+            
+            # Auto-scroll una vez por lote, salvo que el usuario haya subido
+            if self.auto_scroll and self._follow_tail:
+                self.comm_log.moveCursor(QTextCursor.MoveOperation.End)
+                self.comm_log.ensureCursorVisible()
+        finally:
+            self._flushing = False
+        
+        # Actualizar contador
+        self.line_counter.setText(f"Líneas: {document.blockCount()}")
+    
+    def _on_log_scrolled(self, value: int):
+        """Suspender el auto-scroll mientras el usuario no esté al final del log"""
+        if self._flushing:
+            return
+        self._follow_tail = value >= self.comm_log.verticalScrollBar().maximum()
+    
+    def _rerender(self):
+        """Reconstruir el log desde el buffer (p. ej. al cambiar filtros)"""
+        self.comm_log.clear()
+        self._pending.clear()
+        self._pending.extend(
+            self.format_message(*entry)
+            for entry in self.message_buffer
+            if self.should_show_message(entry.direction)
+        )
+        self.line_counter.setText("Líneas: 0")
+        self._flush_log()
+    
     def should_show_message(self, direction: str) -> bool:
         """Verificar si se debe mostrar el mensaje según filtros"""
+        # Sin tab de filtros construido rigen los valores por defecto (mostrar todo)
+        if self._filters_tab is None:
+            return True
         if direction == "TX" and not self.show_tx_checkbox.isChecked():
             return False
         if direction == "RX" and not self.show_rx_checkbox.isChecked():
@@ -481,56 +641,26 @@ class CommunicationDebugWindow(QDialog):
             return False
         return True
     
-    def get_message_color(self, direction: str) -> str:
-        """Obtener color para el tipo de mensaje"""
-        color_map = {
-            "TX": "#00ff00",      # Verde para comandos enviados
-            "RX": "#00aaff",      # Azul para respuestas recibidas
-            "ERROR": "#ff4444",   # Rojo para errores
-            "INFO": "#ffffff",    # Blanco para información
-            "WARNING": "#ffaa00"  # Naranja para advertencias
-        }
-        return color_map.get(direction, "#ffffff")
-    
-    def format_message(self, timestamp: str, direction: str, data: str, color: str) -> str:
+    def format_message(self, timestamp: str, direction: str, data: str) -> str:
         """Formatear mensaje para el log"""
         # Convertir datos hexadecimales a formato legible si es necesario
-        if direction in ["TX", "RX"] and " " in data:
+        if (direction == "TX" or direction == "RX") and " " in data:
             # Es comando hex, agregar interpretación
             interpretation = self.interpret_command(data, direction)
             if interpretation:
                 data = f"{data} [{interpretation}]"
         
-        return f'<span style="color: {color};">[{timestamp}] {direction}: {data}</span>'
+        prefix = _MESSAGE_PREFIXES.get(direction, _DEFAULT_MESSAGE_PREFIX)
+        return f'{prefix}[{timestamp}] {direction}: {data}</span>'
     
-    def interpret_command(self, hex_data: str, direction: str) -> str:
-        """Interpretar comando hexadecimal"""
+    def interpret_command(self, data: Union[str, bytes], direction: str) -> str:
+        """Interpretar comando (trama en bytes o en texto hexadecimal)"""
         try:
-            # Convertir hex string a bytes
-            hex_parts = hex_data.split()
-            if len(hex_parts) < 4:
-                return ""
-            
-            # Parsear componentes básicos
-            if hex_parts[0] == "02":  # STX
-                address = int(hex_parts[1] + hex_parts[2])
-                command = hex_parts[3] + hex_parts[4]
-                
-                command_map = {
-                    "5330": "Leer Estado",
-                    "4B31": "Continuar Secuencia", 
-                    "4B30": "Parar Secuencia",
-                    "5430": "Sincronizar Hora",
-                    "4F31": "OK Download Novedad"
-                }
-                
-                cmd_name = command_map.get(command, f"Comando {command}")
-                return f"Dir:{address} {cmd_name}"
-                
-        except:
-            pass
-        
-        return ""
+            # Solo se necesitan los primeros 5 bytes ("02 30 31 53 30")
+            header = data[:5] if isinstance(data, bytes) else bytes.fromhex(data[:14])
+            return _interpret_header(header)
+        except ValueError:
+            return ""
     
     def clear_log(self):
         """
@@ -538,9 +668,10 @@ class CommunicationDebugWindow(QDialog):
         Equivalente a ClearView_Click en VB6
         """
         self.comm_log.clear()
-        self.line_count = 0
+        self.message_buffer.clear()
+        self._pending.clear()
         self.line_counter.setText("Líneas: 0")
-        self.add_communication_log(datetime.now().strftime("%H:%M:%S"), "INFO", "Log limpiado")
+        self.add_communication_log(_ts(), "INFO", "Log limpiado")
     
     def save_log(self):
         """Guardar log a archivo"""
@@ -553,18 +684,23 @@ class CommunicationDebugWindow(QDialog):
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.comm_log.toPlainText())
+                # Escritura directa desde el buffer (sin recorrer el documento del widget)
+                with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                    f.writelines(
+                        f"[{entry.ts}] {entry.direction}: {entry.data}\n"
+                        for entry in self.message_buffer
+                        if self.should_show_message(entry.direction)
+                    )
                 
                 self.add_communication_log(
-                    datetime.now().strftime("%H:%M:%S"), 
+                    _ts(), 
                     "INFO", 
                     f"Log guardado: {filename}"
                 )
                 
         except Exception as e:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"),
+                _ts(),
                 "ERROR", 
                 f"Error guardando log: {e}"
             )
@@ -577,13 +713,13 @@ class CommunicationDebugWindow(QDialog):
         # Equivalent to Check1 in VB6
         if enabled:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"), 
+                _ts(), 
                 "INFO", 
                 "Monitoreo activado"
             )
         else:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"), 
+                _ts(), 
                 "WARNING", 
                 "Monitoreo pausado"
             )
@@ -595,15 +731,17 @@ class CommunicationDebugWindow(QDialog):
     def set_max_lines(self, value: int):
         """Establecer límite máximo de líneas"""
         self.max_lines = value
+        self.comm_log.setMaximumBlockCount(value)
+        self.message_buffer = deque(self.message_buffer, maxlen=value)
+        self._pending = deque(self._pending, maxlen=value)
+        self.line_counter.setText(f"Líneas: {self.comm_log.blockCount()}")
     
     def send_manual_command(self, address: str, command: str):
         """Enviar comando manual"""
         try:
             if self.polling_manager:
                 # Convertir hex string a comando real
-                hex_parts = command.split()
-                cmd_bytes = bytes([int(h, 16) for h in hex_parts])
-                cmd_string = cmd_bytes.decode('latin-1')
+                cmd_string = bytes.fromhex(command).decode('latin-1')
                 
                 # Enviar comando
                 success = self.polling_manager.send_command(
@@ -611,7 +749,7 @@ class CommunicationDebugWindow(QDialog):
                 )
                 
                 # Log del comando enviado
-                timestamp = datetime.now().strftime("%H:%M:%S")
+                timestamp = _ts()
                 if success:
                     self.add_communication_log(timestamp, "TX", command)
                     self.add_communication_log(timestamp, "INFO", f"Comando enviado a dirección {address}")
@@ -619,14 +757,14 @@ class CommunicationDebugWindow(QDialog):
                     self.add_communication_log(timestamp, "ERROR", f"Error enviando comando a dirección {address}")
             else:
                 self.add_communication_log(
-                    datetime.now().strftime("%H:%M:%S"),
+                    _ts(),
                     "WARNING", 
                     "PollingManager no disponible"
                 )
                 
         except Exception as e:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"),
+                _ts(),
                 "ERROR", 
                 f"Error en comando manual: {e}"
             )
@@ -634,7 +772,7 @@ class CommunicationDebugWindow(QDialog):
     def test_communication(self):
         """Probar comunicación básica"""
         self.add_communication_log(
-            datetime.now().strftime("%H:%M:%S"),
+            _ts(),
             "INFO", 
             "Iniciando prueba de comunicación..."
         )
@@ -644,13 +782,13 @@ class CommunicationDebugWindow(QDialog):
             # Obtener estadísticas del polling
             stats = self.polling_manager.get_polling_statistics()
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"),
+                _ts(),
                 "INFO", 
                 f"Módulos online: {stats.get('online_modules', 0)}/{stats.get('total_modules', 0)}"
             )
         else:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"),
+                _ts(),
                 "WARNING", 
                 "Sistema de polling no disponible"
             )
@@ -662,7 +800,7 @@ class CommunicationDebugWindow(QDialog):
                 # Puerto abierto, cerrar
                 self.port_button.setText("Abrir Puerto")
                 self.add_communication_log(
-                    datetime.now().strftime("%H:%M:%S"),
+                    _ts(),
                     "WARNING", 
                     "Puerto serie cerrado"
                 )
@@ -670,19 +808,22 @@ class CommunicationDebugWindow(QDialog):
                 # Puerto cerrado, abrir
                 self.port_button.setText("Cerrar Puerto")
                 self.add_communication_log(
-                    datetime.now().strftime("%H:%M:%S"),
+                    _ts(),
                     "SUCCESS", 
                     "Puerto serie abierto"
                 )
         else:
             self.add_communication_log(
-                datetime.now().strftime("%H:%M:%S"),
+                _ts(),
                 "ERROR", 
                 "Comunicación serie no disponible"
             )
     
     def update_statistics(self):
         """Actualizar estadísticas mostradas"""
+        if self._stats_tab is None:
+            return
+        
         try:
             # Actualizar contadores básicos
             self.tx_count_label.setText(f"Comandos TX: {self.tx_count}")
@@ -695,10 +836,9 @@ class CommunicationDebugWindow(QDialog):
                 success_rate = ((total - self.error_count) / total) * 100
                 self.success_rate_label.setText(f"Tasa éxito: {success_rate:.1f}%")
             
-            # Actualizar estadísticas por módulo
-            if self.polling_manager:
-                stats_text = "Dirección | Estado | Última Com. | Errores\n"
-                stats_text += "-" * 45 + "\n"
+            # Actualizar estadísticas por módulo (solo con su tab visible)
+            if self.polling_manager and self.tools_tabs.currentWidget() is self._stats_tab:
+                lines = ["Dirección | Estado | Última Com. | Errores", "-" * 45]
                 
                 modules_status = self.polling_manager.get_all_modules_status()
                 for address, status in modules_status.items():
@@ -706,13 +846,23 @@ class CommunicationDebugWindow(QDialog):
                     if isinstance(last_comm, datetime):
                         last_comm = last_comm.strftime("%H:%M:%S")
                     
-                    stats_text += f"{address:^9} | {status.state.name:^6} | {last_comm:^10} | {status.consecutive_errors:^6}\n"
+                    lines.append(f"{address:^9} | {status.state.name:^6} | {last_comm:^10} | {status.consecutive_errors:^6}")
                 
-                self.module_stats_text.setText(stats_text)
+                stats_text = "\n".join(lines)
+                
+                # Evitar el re-layout del texto si no hubo cambios
+                if stats_text != self._last_module_stats:
+                    self._last_module_stats = stats_text
+                    self.module_stats_text.setPlainText(stats_text)
                 
         except Exception as e:
             log_error(e, "update_statistics")
     
+    def showEvent(self, event):
+        """Mostrar el historial reciente al abrir la ventana"""
+        super().showEvent(event)
+        self._rerender()
+    
     def closeEvent(self, event):
         """Manejar cierre de la ventana"""
         # Detener monitor de comunicación
@@ -722,10 +872,12 @@ class CommunicationDebugWindow(QDialog):
         # Detener timers
         if hasattr(self, 'stats_timer'):
             self.stats_timer.stop()
+        if hasattr(self, '_flush_timer'):
+            self._flush_timer.stop()
         
         # Equivalent to setting MPolling.IsViewing = False in VB6
         self.add_communication_log(
-            datetime.now().strftime("%H:%M:%S"),
+            _ts(),
             "INFO", 
             "Ventana de debug cerrada"
         )
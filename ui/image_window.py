@@ -4,6 +4,11 @@ Ventana de visualización de imágenes
 Equivalente a FrmImg.frm en VB6
 """
 import os
+import re
+import html
+import time
+import threading
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from datetime import datetime
 from pathlib import Path
@@ -13,51 +18,249 @@ from PyQt6.QtWidgets import (
     QSpacerItem, QMessageBox, QFileDialog, QApplication
 )
 from PyQt6.QtCore import (
-    Qt, QSize, QTimer, pyqtSignal, QThread, QMutex, QMutexLocker
+    Qt, QSize, QRectF, QTimer, QObject, pyqtSignal, pyqtSlot, QThread,
+    QFileSystemWatcher, QRunnable, QThreadPool
 )
 from PyQt6.QtGui import (
-    QPixmap, QFont, QPainter, QPen, QColor, QBrush, QResizeEvent
+    QPixmap, QImage, QImageReader, QFont, QPainter, QPen, QColor, QResizeEvent
 )
 
 from core.database.managers import MovementManager, PersonManager
 from camera_integration.hikvision_manager import HikvisionManager
 from utils.logger import log_error, log_system
 
-class ImageLoader(QThread):
+# Hojas de estilo constantes (se parsean una vez, no por instancia)
+_STYLE_DISPLAY = (
+    "QLabel { border: 2px solid #cccccc; background-color: #f0f0f0; "
+    "qproperty-alignment: AlignCenter; }"
+)
+_STYLE_STATUS = "color: #666666; font-style: italic;"
+# Respaldo de la regla [state="alert"] de wpc.qss si no hay estilos globales
+_STYLE_ALERT = "QGroupBox { border: 2px solid red; font-weight: bold; }"
+
+# Cache de detalles de movimiento: absorbe disparos duplicados de la UI
+MOVEMENT_CACHE_TTL = 5.0  # segundos
+MOVEMENT_CACHE_SIZE = 64
+
+@lru_cache(maxsize=128)
+def _render_overlay_strip(info_tuple: tuple, width: int) -> QPixmap:
     """
-    Hilo separado para cargar imágenes sin bloquear la UI
+    Rasterizar una sola vez el texto superpuesto sobre una franja semitransparente
+    
+    Args:
+        info_tuple: Líneas de información a mostrar
+        width: Ancho de la imagen destino
+        
+    Returns:
+        Franja con el texto ya dibujado
+    """
+    strip = QPixmap(max(width, 1), 25 * len(info_tuple) + 10)
+    strip.fill(QColor(0, 0, 0, 128))
+    
+    painter = QPainter(strip)
+    try:
+        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        painter.setPen(QPen(QColor(255, 255, 255), 2))
+        
+        # Un solo drawText con el bloque completo: Qt distribuye las líneas
+        rect = QRectF(10, 10, strip.width() - 20, strip.height() - 20)
+        painter.drawText(
+            rect,
+            int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop),
+            '\n'.join(info_tuple)
+        )
+    finally:
+        painter.end()
+    
+    return strip
+
+@lru_cache(maxsize=256)
+def _dir_listing(directory: str, mtime: float) -> frozenset:
+    """
+    Nombres de archivo de un directorio (cacheado por mtime del directorio)
+    
+    Args:
+        directory: Directorio a listar
+        mtime: Fecha de modificación del directorio, invalida el cache al cambiar
+        
+    Returns:
+        Conjunto de nombres de entradas del directorio
+    """
+    with os.scandir(directory) as entries:
+        return frozenset(entry.name for entry in entries)
+
+# Directorios de imágenes de movimientos, de menor a mayor prioridad
+IMAGE_INDEX_DIRS = ("images", "temp/camera_images")
+_IMAGE_NAME_RE = re.compile(r'(mvt_)?(\d+)(?:_\d+)?\.(?:jpg|png)$', re.IGNORECASE)
+
+def _index_image_file(filename: str, path: str, rank: int, index: Dict[int, tuple]):
+    """
+    Registrar un archivo en el índice si su nombre corresponde a un movimiento
+    
+    Args:
+        filename: Nombre del archivo
+        path: Ruta completa del archivo
+        rank: Prioridad del directorio raíz
+        index: movement_id -> (prioridad, ruta), se actualiza en el lugar
+    """
+    match = _IMAGE_NAME_RE.match(filename)
+    if not match:
+        return
+    
+    # Dentro de un mismo raíz, "<id>..." tiene prioridad sobre "mvt_<id>"
+    priority = (rank, match.group(1) is None)
+    movement_id = int(match.group(2))
+    current = index.get(movement_id)
+    if current is None or priority >= current[0]:
+        index[movement_id] = (priority, path)
+
+def _scan_image_dir(directory: str, rank: int, index: Dict[int, tuple]) -> list:
+    """
+    Indexar las imágenes de un directorio (sin recursión)
+    
+    Args:
+        directory: Directorio a recorrer
+        rank: Prioridad del directorio raíz
+        index: movement_id -> (prioridad, ruta), se actualiza en el lugar
+        
+    Returns:
+        Lista de subdirectorios encontrados
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    _index_image_file(entry.name, entry.path, rank, index)
+    except OSError:
+        pass
+    return subdirs
+
+class _ImageIndexBuilder(QThread):
+    """
+    Construye en segundo plano el índice movement_id -> ruta de imagen
+    """
+    built = pyqtSignal(dict, list)  # index, directorios recorridos
+    
+    def run(self):
+        index: Dict[int, tuple] = {}
+        directories = []
+        # Una sola pasada de os.walk por raíz: un readdir por directorio
+        for rank, root in enumerate(IMAGE_INDEX_DIRS):
+            for dirpath, _dirnames, filenames in os.walk(root):
+                directories.append(dirpath)
+                for filename in filenames:
+                    _index_image_file(filename, os.path.join(dirpath, filename),
+                                      rank, index)
+        self.built.emit(index, directories)
+
+class _MovementImageIndex(QObject):
+    """
+    Índice en memoria de imágenes de movimientos compartido por las ventanas
+    
+    Se construye una vez en segundo plano y se mantiene actualizado con un
+    QFileSystemWatcher sobre los directorios de imágenes.
     """
-    image_loaded = pyqtSignal(QPixmap, dict)  # pixmap, movement_info
-    load_failed = pyqtSignal(str)  # error_message
     
     def __init__(self):
         super().__init__()
-        self.movement_id = None
-        self.image_path = None
-        self.movement_info = {}
-        self.mutex = QMutex()
+        self._index: Dict[int, tuple] = {}
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        
+        self._builder = _ImageIndexBuilder(self)
+        self._builder.built.connect(self._on_built)
+        self._builder.start(QThread.Priority.LowPriority)
     
-    def load_image(self, movement_id: int, image_path: str, movement_info: dict):
-        """Cargar imagen en hilo separado"""
-        with QMutexLocker(self.mutex):
-            self.movement_id = movement_id
-            self.image_path = image_path
-            self.movement_info = movement_info
+    def get(self, movement_id: int) -> Optional[str]:
+        """Ruta de la imagen de un movimiento o None si no está indexada"""
+        entry = self._index.get(movement_id)
+        return entry[1] if entry is not None else None
+    
+    def _on_built(self, index: dict, directories: list):
+        """Incorporar el índice construido y vigilar sus directorios"""
+        # Las entradas agregadas por el watcher durante la construcción se conservan
+        index.update(self._index)
+        self._index = index
+        if directories:
+            self._watcher.addPaths(directories)
+    
+    def _rank_for(self, directory: str) -> int:
+        """Prioridad del directorio raíz que contiene a directory"""
+        normalized = os.path.normpath(directory)
+        for rank in range(len(IMAGE_INDEX_DIRS) - 1, -1, -1):
+            root = os.path.normpath(IMAGE_INDEX_DIRS[rank])
+            if normalized == root or normalized.startswith(root + os.sep):
+                return rank
+        return 0
+    
+    def _on_directory_changed(self, directory: str):
+        """Reindexar un directorio modificado y vigilar subdirectorios nuevos"""
+        rank = self._rank_for(directory)
+        watched = set(self._watcher.directories())
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            # Quitar entradas del directorio (pudieron borrarse) y volver a leerlo
+            stale = [movement_id for movement_id, (_, path) in self._index.items()
+                     if os.path.dirname(path) == current]
+            for movement_id in stale:
+                del self._index[movement_id]
+            subdirs = _scan_image_dir(current, rank, self._index)
+            new_dirs = [d for d in subdirs if d not in watched]
+            if new_dirs:
+                self._watcher.addPaths(new_dirs)
+                watched.update(new_dirs)
+                pending.extend(new_dirs)
+
+_image_index: Optional[_MovementImageIndex] = None
+
+def _get_image_index() -> _MovementImageIndex:
+    """Obtener (y crear la primera vez) el índice compartido de imágenes"""
+    global _image_index
+    if _image_index is None:
+        _image_index = _MovementImageIndex()
+    return _image_index
+
+class _ImageWorker(QObject):
+    """
+    Trabajador de carga de imágenes que vive en un QThread propio
+    
+    Las solicitudes llegan por conexión encolada y se procesan en el event
+    loop del hilo, por lo que una solicitud recibida durante una carga no se
+    pierde: se procesa a continuación.
+    """
+    image_loaded = pyqtSignal(QImage, dict)  # image, movement_info
+    load_failed = pyqtSignal(str)  # error_message
+    movement_resolved = pyqtSignal(int, object, object)  # generation, movement_id, resolved
+    
+    def __init__(self):
+        super().__init__()
+        # Cancelación cooperativa (reemplaza a terminate())
+        self.cancel_event = threading.Event()
+        
+        # Solo importa la última solicitud: las anteriores se descartan
+        self.latest_generation = 0
         
-        if not self.isRunning():
-            self.start()
+        # Resolución máxima de decodificación (None = resolución original)
+        self.target_size: Optional[QSize] = None
     
-    def run(self):
-        """Ejecutar carga de imagen"""
+    @pyqtSlot(int, object, str, dict)
+    def load(self, generation: int, movement_id, image_path: str, movement_info: dict):
+        """Cargar una imagen y emitir el resultado"""
+        if generation != self.latest_generation or self.cancel_event.is_set():
+            return
+        
         try:
-            with QMutexLocker(self.mutex):
-                image_path = self.image_path
-                movement_info = self.movement_info.copy()
-            
             if image_path and os.path.exists(image_path):
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    self.image_loaded.emit(pixmap, movement_info)
+                # QImage (no QPixmap) es seguro para crear fuera del hilo de UI
+                image = self._read_image(image_path)
+                if generation != self.latest_generation or self.cancel_event.is_set():
+                    return
+                if not image.isNull():
+                    self.image_loaded.emit(image, movement_info)
                 else:
                     self.load_failed.emit(f"Error cargando imagen: {image_path}")
             else:
@@ -65,6 +268,150 @@ class ImageLoader(QThread):
                 
         except Exception as e:
             self.load_failed.emit(f"Error en carga de imagen: {e}")
+    
+    @pyqtSlot(int, object, object, object)
+    def load_movement(self, generation: int, movement_id, movement_info, resolver):
+        """
+        Resolver detalles e imagen de un movimiento y cargar la imagen
+        
+        Args:
+            generation: Número de solicitud (las viejas se descartan)
+            movement_id: ID del movimiento
+            movement_info: Detalles ya conocidos o None para consultarlos
+            resolver: Función (movement_id, movement_info) ->
+                (movement_info, image_path) o None si el movimiento no existe
+        """
+        if generation != self.latest_generation or self.cancel_event.is_set():
+            return
+        
+        try:
+            resolved = resolver(movement_id, movement_info)
+        except Exception as e:
+            self.load_failed.emit(f"Error obteniendo movimiento: {e}")
+            return
+        
+        if generation != self.latest_generation or self.cancel_event.is_set():
+            return
+        
+        self.movement_resolved.emit(generation, movement_id, resolved)
+        if resolved is not None and resolved[1]:
+            self.load(generation, movement_id, resolved[1], resolved[0])
+    
+    def _read_image(self, image_path: str) -> QImage:
+        """
+        Decodificar imagen directamente a la resolución objetivo
+        
+        Para JPEG el plugin de Qt usa la decodificación escalada de libjpeg
+        (1/2, 1/4, 1/8), por lo que no se descomprime la imagen completa.
+        
+        Args:
+            image_path: Ruta del archivo de imagen
+            
+        Returns:
+            Imagen decodificada (nula si hubo error)
+        """
+        reader = QImageReader(image_path)
+        reader.setAutoTransform(True)
+        
+        target_size = self.target_size
+        src_size = reader.size()
+        if (target_size is not None and src_size.isValid()
+                and (src_size.width() > target_size.width()
+                     or src_size.height() > target_size.height())):
+            reader.setScaledSize(
+                src_size.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio)
+            )
+        
+        return reader.read()
+
+class ImageLoader(QObject):
+    """
+    Carga de imágenes en un hilo separado sin bloquear la UI
+    
+    Mantiene un _ImageWorker de larga vida movido a un QThread propio.
+    """
+    image_loaded = pyqtSignal(QImage, dict)  # image, movement_info
+    load_failed = pyqtSignal(str)  # error_message
+    movement_resolved = pyqtSignal(object, object)  # movement_id, (movement_info, image_path) o None
+    request_load = pyqtSignal(int, object, str, dict)
+    request_movement = pyqtSignal(int, object, object, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        
+        self._thread = QThread(self)
+        self._worker = _ImageWorker()
+        self._worker.moveToThread(self._thread)
+        
+        self.request_load.connect(self._worker.load, Qt.ConnectionType.QueuedConnection)
+        self.request_movement.connect(self._worker.load_movement,
+                                      Qt.ConnectionType.QueuedConnection)
+        self._worker.image_loaded.connect(self.image_loaded)
+        self._worker.movement_resolved.connect(self._on_movement_resolved)
+        self._worker.load_failed.connect(self.load_failed)
+        self._thread.finished.connect(self._worker.deleteLater)
+        
+        self._thread.start()
+    
+    @property
+    def target_size(self) -> Optional[QSize]:
+        """Resolución máxima de decodificación"""
+        return self._worker.target_size
+    
+    @target_size.setter
+    def target_size(self, size: Optional[QSize]):
+        self._worker.target_size = size
+    
+    def load_image(self, movement_id: int, image_path: str, movement_info: dict):
+        """Cargar imagen en hilo separado"""
+        self._generation += 1
+        self._worker.latest_generation = self._generation
+        self._worker.cancel_event.clear()
+        self.request_load.emit(self._generation, movement_id, image_path, dict(movement_info))
+    
+    def load_movement(self, movement_id: int, movement_info: Optional[dict], resolver):
+        """
+        Resolver un movimiento y cargar su imagen en el hilo separado
+        
+        La consulta de detalles (base de datos) y la búsqueda de la imagen
+        corren en el hilo de carga; movement_resolved informa el resultado.
+        
+        Args:
+            movement_id: ID del movimiento
+            movement_info: Detalles ya conocidos o None para consultarlos
+            resolver: Ver _ImageWorker.load_movement
+        """
+        self._generation += 1
+        self._worker.latest_generation = self._generation
+        self._worker.cancel_event.clear()
+        self.request_movement.emit(self._generation, movement_id, movement_info, resolver)
+    
+    def _on_movement_resolved(self, generation: int, movement_id, resolved):
+        """Reenviar el resultado solo si corresponde a la última solicitud"""
+        if generation == self._generation:
+            self.movement_resolved.emit(movement_id, resolved)
+    
+    def discard_pending(self):
+        """Descartar el resultado de cualquier carga encolada o en curso"""
+        self._generation += 1
+        self._worker.latest_generation = self._generation
+    
+    def cancel(self):
+        """Solicitar la cancelación de la carga en curso"""
+        self._worker.cancel_event.set()
+    
+    def stop(self):
+        """
+        Cancelar y detener el hilo de carga
+        
+        Espera sin límite a que termine: el QThread es hijo de la ventana
+        y Qt no puede destruirlo mientras una decodificación o consulta
+        sigue en curso. La cancelación acota la espera a la tarea actual.
+        """
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
 
 class ImageDisplayWidget(QLabel):
     """
@@ -75,145 +422,231 @@ class ImageDisplayWidget(QLabel):
         super().__init__()
         
         self.window_type = window_type  # Equivalente a TipoVentana en VB6
-        self.original_pixmap: Optional[QPixmap] = None
+        self.original_image: Optional[QImage] = None
         self.movement_info: Dict[str, Any] = {}
         
+        # Clave del último resultado escalado: (tamaño, cacheKey origen, overlay)
+        self._last_scaled_key = None
+        
+        # Durante un redimensionamiento interactivo se escala en modo rápido y
+        # la pasada de calidad se hace al detenerse (ver resizeEvent)
+        self._is_resizing = False
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._do_smooth_rescale)
+        
+        # Agrupar ráfagas de resizeEvent: como máximo un reescalado por cuadro
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self.update_displayed_image)
+        
         # Configuración inicial
         self.setMinimumSize(320, 240)
-        self.setStyleSheet("""
-            QLabel {
-                border: 2px solid #cccccc;
-                background-color: #f0f0f0;
-                qproperty-alignment: AlignCenter;
-            }
-        """)
+        self.setStyleSheet(_STYLE_DISPLAY)
         
         # Texto por defecto
         self.setText("Sin imagen")
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
-    def set_image(self, pixmap: QPixmap, movement_info: dict):
+    def set_image(self, image: QImage, movement_info: dict):
         """
         Establecer imagen a mostrar
         
         Args:
-            pixmap: Imagen a mostrar
+            image: Imagen a mostrar (se acepta QPixmap por compatibilidad)
             movement_info: Información del movimiento asociado
         """
-        self.original_pixmap = pixmap
+        if isinstance(image, QPixmap):
+            image = image.toImage()
+        self.original_image = image
         self.movement_info = movement_info
         self.update_displayed_image()
     
     def update_displayed_image(self):
         """Actualizar imagen mostrada con redimensionamiento"""
-        if self.original_pixmap is None:
+        # Oculto no hay nada que pintar: showEvent actualiza al mostrarse
+        if not self.isVisible() or self.original_image is None:
             return
         
-        # Redimensionar manteniendo aspecto
         label_size = self.size()
-        scaled_pixmap = self.original_pixmap.scaled(
+        
+        # Sin overlay durante el redimensionamiento interactivo
+        if self._is_resizing or self.window_type not in (2, 3):
+            overlay_lines = ()
+        else:
+            overlay_lines = self.get_overlay_lines()
+        
+        transformation = (Qt.TransformationMode.FastTransformation if self._is_resizing
+                          else Qt.TransformationMode.SmoothTransformation)
+        
+        # Reutilizar el último resultado si nada cambió (resizeEvents redundantes)
+        cache_key = (label_size.width(), label_size.height(),
+                     self.original_image.cacheKey(), overlay_lines, self._is_resizing)
+        if cache_key == self._last_scaled_key:
+            return
+        
+        # Redimensionar manteniendo aspecto (en CPU) y convertir una sola vez
+        source = self.original_image
+        ratio = max(source.width() / max(label_size.width(), 1),
+                    source.height() / max(label_size.height(), 1))
+        if ratio > 2 and not self._is_resizing:
+            # Reducción fuerte: primero rápido a ~2x del destino y luego suave,
+            # el filtrado bilineal sobre la imagen completa no aporta calidad
+            source = source.scaled(
+                label_size * 2,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.FastTransformation
+            )
+        
+        scaled_image = source.scaled(
             label_size,
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            transformation
         )
+        scaled_pixmap = QPixmap.fromImage(scaled_image)
         
-        # Agregar información superpuesta si es necesario
-        if self.movement_info and self.window_type in [2, 3]:
-            scaled_pixmap = self.add_overlay_info(scaled_pixmap)
+        # Agregar información superpuesta si es necesario (en el lugar,
+        # scaled_pixmap es un pixmap nuevo que nadie más referencia)
+        if overlay_lines:
+            self.add_overlay_info(scaled_pixmap)
         
+        self._last_scaled_key = cache_key
         self.setPixmap(scaled_pixmap)
     
+    def get_overlay_lines(self) -> tuple:
+        """Líneas de información a superponer sobre la imagen"""
+        info_lines = []
+        if 'person_name' in self.movement_info:
+            info_lines.append(f"Persona: {self.movement_info['person_name']}")
+        if 'movement_time' in self.movement_info:
+            info_lines.append(f"Hora: {self.movement_info['movement_time']}")
+        if 'module_name' in self.movement_info:
+            info_lines.append(f"Módulo: {self.movement_info['module_name']}")
+        return tuple(info_lines)
+    
     def add_overlay_info(self, pixmap: QPixmap) -> QPixmap:
         """
         Agregar información superpuesta a la imagen
         
+        Pinta directamente sobre el pixmap recibido: debe ser una copia
+        privada (como el resultado recién escalado de update_displayed_image).
+        
         Args:
-            pixmap: Imagen base
+            pixmap: Imagen base, se modifica en el lugar
             
         Returns:
-            Imagen con información superpuesta
+            La misma imagen con información superpuesta
         """
-        # Crear copia para modificar
-        overlay_pixmap = QPixmap(pixmap)
-        painter = QPainter(overlay_pixmap)
+        info_tuple = self.get_overlay_lines()
+        if not info_tuple:
+            return pixmap
         
+        # Franja de texto cacheada por contenido y ancho
+        strip = _render_overlay_strip(info_tuple, pixmap.width())
+        
+        painter = QPainter(pixmap)
         try:
-            # Configurar fuente y color
-            font = QFont("Arial", 12, QFont.Weight.Bold)
-            painter.setFont(font)
-            
-            # Fondo semitransparente para el texto
-            painter.setPen(QPen(QColor(255, 255, 255), 2))
-            painter.setBrush(QBrush(QColor(0, 0, 0, 128)))
-            
-            # Información a mostrar
-            info_lines = []
-            if 'person_name' in self.movement_info:
-                info_lines.append(f"Persona: {self.movement_info['person_name']}")
-            if 'movement_time' in self.movement_info:
-                info_lines.append(f"Hora: {self.movement_info['movement_time']}")
-            if 'module_name' in self.movement_info:
-                info_lines.append(f"Módulo: {self.movement_info['module_name']}")
-            
-            # Dibujar información
-            y_offset = 25
-            for line in info_lines:
-                painter.drawText(10, y_offset, line)
-                y_offset += 25
-                
+            painter.drawPixmap(0, 0, strip)
         finally:
             painter.end()
         
-        return overlay_pixmap
+        return pixmap
     
     def clear_image(self):
         """Limpiar imagen mostrada"""
-        self.original_pixmap = None
+        self.original_image = None
         self.movement_info = {}
+        self._last_scaled_key = None
+        self._resize_timer.stop()
+        self._repaint_timer.stop()
+        self._is_resizing = False
         self.setText("Sin imagen")
         self.setPixmap(QPixmap())
     
     def resizeEvent(self, event: QResizeEvent):
         """Manejar redimensionamiento del widget"""
         super().resizeEvent(event)
+        
+        if self.original_image is None:
+            return
+        
+        # Pasada rápida en el próximo cuadro y pasada de calidad 80 ms
+        # después del último evento
+        self._is_resizing = True
+        self._repaint_timer.start()
+        self._resize_timer.start(80)
+    
+    def showEvent(self, event):
+        """Pintar la imagen pendiente al hacerse visible"""
+        super().showEvent(event)
+        self.update_displayed_image()
+    
+    def _do_smooth_rescale(self):
+        """Escalado final de calidad al terminar el redimensionamiento"""
+        self._repaint_timer.stop()
+        self._is_resizing = False
         self.update_displayed_image()
     
     def mousePressEvent(self, event):
         """Manejar clic en la imagen"""
-        if event.button() == Qt.MouseButton.LeftButton and self.original_pixmap:
+        if event.button() == Qt.MouseButton.LeftButton and self.original_image is not None:
             # Mostrar imagen en tamaño completo
             self.show_fullsize_image()
         super().mousePressEvent(event)
     
     def show_fullsize_image(self):
         """Mostrar imagen en tamaño completo en ventana separada"""
-        if not self.original_pixmap:
+        if self.original_image is None:
             return
         
         try:
             # Crear ventana de imagen completa
-            fullsize_window = ImageFullsizeWindow(self.original_pixmap, self.movement_info)
+            fullsize_window = ImageFullsizeWindow(self.original_image, self.movement_info)
             fullsize_window.show()
             
         except Exception as e:
             log_error(e, "show_fullsize_image")
 
+class _SaveSignals(QObject):
+    """Señales de _SaveRunnable (QRunnable no es un QObject)"""
+    finished = pyqtSignal(bool, str)  # éxito, nombre de archivo
+
+class _SaveRunnable(QRunnable):
+    """
+    Codificar y guardar una imagen en el pool de hilos de Qt
+    """
+    
+    def __init__(self, image: QImage, filename: str):
+        super().__init__()
+        self.image = image
+        self.filename = filename
+        self.signals = _SaveSignals()
+    
+    def run(self):
+        # Formato explícito según la extensión; JPEG con calidad fija
+        if self.filename.lower().endswith('.png'):
+            success = self.image.save(self.filename, "PNG")
+        else:
+            success = self.image.save(self.filename, "JPG", 85)
+        self.signals.finished.emit(success, self.filename)
+
 class ImageFullsizeWindow(QWidget):
     """
     Ventana para mostrar imagen en tamaño completo
     """
     
-    def __init__(self, pixmap: QPixmap, movement_info: dict, parent=None):
+    def __init__(self, image: QImage, movement_info: dict, parent=None):
         super().__init__(parent)
         
-        self.original_pixmap = pixmap
+        self.original_image = image
         self.movement_info = movement_info
         
         self.setup_ui()
         self.setWindowTitle("Imagen - Tamaño Completo")
         
         # Configurar tamaño inicial
-        self.resize(min(pixmap.width() + 50, 800), min(pixmap.height() + 100, 600))
+        self.resize(min(image.width() + 50, 800), min(image.height() + 100, 600))
     
     def setup_ui(self):
         """Configurar interfaz"""
@@ -221,33 +654,39 @@ class ImageFullsizeWindow(QWidget):
         
         # Información del movimiento
         if self.movement_info:
-            info_group = QGroupBox("Información del Evento")
-            info_layout = QGridLayout(info_group)
-            
-            row = 0
-            for key, value in self.movement_info.items():
-                label = QLabel(f"{key.replace('_', ' ').title()}:")
-                value_label = QLabel(str(value))
-                value_label.setStyleSheet("font-weight: bold;")
-                
-                info_layout.addWidget(label, row, 0)
-                info_layout.addWidget(value_label, row, 1)
-                row += 1
+            # Una sola etiqueta con tabla HTML en lugar de dos QLabel por campo
+            rows = ''.join(
+                f"<tr><td>{html.escape(key.replace('_', ' ').title())}:</td>"
+                f"<td><b>{html.escape(str(value))}</b></td></tr>"
+                for key, value in self.movement_info.items()
+            )
+            info_label = QLabel(f"<table>{rows}</table>")
+            info_label.setTextFormat(Qt.TextFormat.RichText)
             
-            layout.addWidget(info_group)
-        
-        # Scroll area para la imagen
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            if len(self.movement_info) > 1:
+                info_group = QGroupBox("Información del Evento")
+                info_layout = QVBoxLayout(info_group)
+                info_layout.addWidget(info_label)
+                layout.addWidget(info_group)
+            else:
+                layout.addWidget(info_label)
         
         # Widget de imagen
         image_label = QLabel()
-        image_label.setPixmap(self.original_pixmap)
+        image_label.setPixmap(QPixmap.fromImage(self.original_image))
         image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        scroll_area.setWidget(image_label)
-        layout.addWidget(scroll_area)
+        # Scroll area solo si la imagen no entra en el tamaño inicial (800x600)
+        needs_scroll = (self.original_image.width() > 760
+                        or self.original_image.height() > 560)
+        if needs_scroll:
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            scroll_area.setWidget(image_label)
+            layout.addWidget(scroll_area)
+        else:
+            layout.addWidget(image_label)
         
         # Botones
         buttons_layout = QHBoxLayout()
@@ -274,14 +713,20 @@ class ImageFullsizeWindow(QWidget):
             )
             
             if filename:
-                success = self.original_pixmap.save(filename)
-                if success:
-                    QMessageBox.information(self, "Éxito", f"Imagen guardada: {filename}")
-                else:
-                    QMessageBox.warning(self, "Error", "No se pudo guardar la imagen")
+                # Codificar fuera del hilo de UI; el resultado llega por señal
+                runnable = _SaveRunnable(self.original_image, filename)
+                runnable.signals.finished.connect(self.on_image_saved)
+                QThreadPool.globalInstance().start(runnable)
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error guardando imagen: {e}")
+    
+    def on_image_saved(self, success: bool, filename: str):
+        """Informar el resultado del guardado"""
+        if success:
+            QMessageBox.information(self, "Éxito", f"Imagen guardada: {filename}")
+        else:
+            QMessageBox.warning(self, "Error", "No se pudo guardar la imagen")
 
 class WPCImageWindow(QWidget):
     """
@@ -295,6 +740,7 @@ class WPCImageWindow(QWidget):
     def __init__(self, window_type: int = 1, movement_id: Optional[int] = None,
                  image_path: Optional[str] = None,
                  camera_manager: Optional[HikvisionManager] = None,
+                 reusable: bool = False,
                  parent=None):
         super().__init__(parent)
 
@@ -306,10 +752,23 @@ class WPCImageWindow(QWidget):
         self.movement_id = movement_id
         self.image_path = image_path
         
+        # Una ventana reutilizable solo se oculta al cerrarse: conserva el
+        # loader y el timer para mostrar el siguiente evento
+        self.reusable = reusable
+        
+        # movement_id -> (instante monotónico, detalles)
+        self._mv_cache: Dict[int, tuple] = {}
+        
         # Loader de imágenes en hilo separado
-        self.image_loader = ImageLoader()
+        self.image_loader = ImageLoader(self)
         self.image_loader.image_loaded.connect(self.on_image_loaded)
         self.image_loader.load_failed.connect(self.on_image_load_failed)
+        self.image_loader.movement_resolved.connect(self._on_movement_resolved)
+        
+        # Decodificar como máximo al tamaño de pantalla disponible
+        screen = QApplication.primaryScreen()
+        if screen is not None:
+            self.image_loader.target_size = screen.availableSize()
         
         # Timer para auto-cerrar ventana (como en VB6)
         self.auto_close_timer = QTimer()
@@ -362,7 +821,7 @@ class WPCImageWindow(QWidget):
         
         # Estado de carga
         self.status_label = QLabel("Listo")
-        self.status_label.setStyleSheet("color: #666666; font-style: italic;")
+        self.status_label.setStyleSheet(_STYLE_STATUS)
         main_layout.addWidget(self.status_label)
         
         # Información adicional de la imagen (ruta, tamaño, etc.)
@@ -391,6 +850,9 @@ class WPCImageWindow(QWidget):
     
     def setup_connections(self):
         """Configurar conexiones del sistema"""
+        # Índice de imágenes compartido (se construye en segundo plano)
+        self._image_index = _get_image_index()
+        
         try:
             # Inicializar gestor de cámaras Hikvision si está disponible
             self.hikvision_manager = HikvisionManager()
@@ -422,12 +884,11 @@ class WPCImageWindow(QWidget):
             # Ventana de alerta - auto-close en 5 segundos  
             self.setWindowTitle("WPC - Imagen Alerta")
             self.auto_close_timer.start(5000)  # 5 segundos
-            self.setStyleSheet("""
-                QGroupBox {
-                    border: 2px solid red;
-                    font-weight: bold;
-                }
-            """)
+            # El estilo de alerta vive en la hoja global (wpc.qss)
+            self.setProperty("state", "alert")
+            app = QApplication.instance()
+            if app is None or not app.styleSheet():
+                self.setStyleSheet(_STYLE_ALERT)
     
     def show_movement_image(self, movement_id: int):
         """
@@ -441,31 +902,85 @@ class WPCImageWindow(QWidget):
             self.current_movement_id = movement_id
             self.status_label.setText("Cargando información del evento...")
             
-            # Obtener información del movimiento
-            movement_info = self.movement_manager.get_movement_details(movement_id)
-            
-            if not movement_info:
-                self.status_label.setText("Movimiento no encontrado")
-                return
-            
-            # Actualizar información mostrada
-            self.update_movement_info(movement_info)
-            
-            # Buscar imagen asociada
-            image_path = self.get_movement_image_path(movement_id, movement_info)
+            # Detalles recientes: mostrarlos ya, sin volver a consultar
+            movement_info = self._cached_movement_details(movement_id)
+            if movement_info:
+                self.update_movement_info(movement_info)
             
-            if image_path:
-                self.status_label.setText("Cargando imagen...")
-                # Cargar imagen en hilo separado
-                self.image_loader.load_image(movement_id, image_path, movement_info)
-            else:
-                self.status_label.setText("Sin imagen disponible")
-                self.image_widget.clear_image()
+            # Consulta a la base, búsqueda y carga de la imagen en el hilo
+            # del loader; el resultado llega a _on_movement_resolved
+            self.image_loader.load_movement(movement_id, movement_info,
+                                            self._resolve_movement)
                 
         except Exception as e:
             log_error(e, "show_movement_image")
             self.status_label.setText(f"Error: {e}")
     
+    def _resolve_movement(self, movement_id: int,
+                          movement_info: Optional[dict]) -> Optional[tuple]:
+        """
+        Obtener detalles y ruta de imagen de un movimiento (hilo del loader)
+        
+        Args:
+            movement_id: ID del movimiento
+            movement_info: Detalles ya conocidos o None para consultarlos
+            
+        Returns:
+            Tupla (movement_info, image_path) o None si el movimiento no existe
+        """
+        if movement_info is None:
+            movement_info = self.movement_manager.get_movement_details(movement_id)
+            if not movement_info:
+                return None
+        
+        return movement_info, self.get_movement_image_path(movement_id, movement_info)
+    
+    def _on_movement_resolved(self, movement_id: int, resolved: Optional[tuple]):
+        """Mostrar los detalles resueltos en el hilo del loader"""
+        if resolved is None:
+            self.status_label.setText("Movimiento no encontrado")
+            return
+        
+        movement_info, image_path = resolved
+        if self._cached_movement_details(movement_id) is None:
+            self._store_movement_details(movement_id, movement_info)
+        
+        # Actualizar información mostrada
+        self.update_movement_info(movement_info)
+        
+        if image_path:
+            # La imagen ya se está cargando en el mismo hilo
+            self.status_label.setText("Cargando imagen...")
+        else:
+            self.status_label.setText("Sin imagen disponible")
+            self.image_widget.clear_image()
+    
+    def _cached_movement_details(self, movement_id: int) -> Optional[dict]:
+        """
+        Detalles del movimiento si se consultaron hace menos de MOVEMENT_CACHE_TTL
+        
+        Args:
+            movement_id: ID del movimiento
+            
+        Returns:
+            Detalles del movimiento o None si no están en cache
+        """
+        cached = self._mv_cache.get(movement_id)
+        if cached is not None and time.monotonic() - cached[0] < MOVEMENT_CACHE_TTL:
+            return cached[1]
+        return None
+    
+    def _store_movement_details(self, movement_id: int, movement_info: dict):
+        """Guardar detalles consultados en el cache de vida corta (hilo de UI)"""
+        now = time.monotonic()
+        if len(self._mv_cache) >= MOVEMENT_CACHE_SIZE:
+            # Descartar entradas vencidas; si no alcanza, la más antigua
+            self._mv_cache = {k: v for k, v in self._mv_cache.items()
+                              if now - v[0] < MOVEMENT_CACHE_TTL}
+            if len(self._mv_cache) >= MOVEMENT_CACHE_SIZE:
+                self._mv_cache.pop(next(iter(self._mv_cache)))
+        self._mv_cache[movement_id] = (now, movement_info)
+    
     def update_movement_info(self, movement_info: dict):
         """Actualizar información del movimiento en la UI"""
         try:
@@ -508,7 +1023,12 @@ class WPCImageWindow(QWidget):
             Ruta de la imagen o None si no existe
         """
         try:
-            # Construir ruta basada en fecha y movimiento
+            # Búsqueda directa en el índice, sin acceder al disco
+            indexed_path = self._image_index.get(movement_id)
+            if indexed_path is not None:
+                return indexed_path
+            
+            # Índice aún no construido o imagen recién creada: buscar por fecha
             movement_time = movement_info.get('movement_time')
             if not movement_time:
                 return None
@@ -527,10 +1047,22 @@ class WPCImageWindow(QWidget):
                 f"images/movements/mvt_{movement_id}.jpg"
             ]
             
-            # Buscar en las rutas posibles
+            # Agrupar candidatos por directorio: un listado por directorio
+            # en lugar de un stat por ruta
+            candidates_by_dir: Dict[str, list] = {}
             for path in possible_paths:
-                if os.path.exists(path):
-                    return path
+                directory, filename = os.path.split(path)
+                candidates_by_dir.setdefault(directory, []).append(filename)
+            
+            for directory, filenames in candidates_by_dir.items():
+                try:
+                    entries = _dir_listing(directory, os.stat(directory).st_mtime)
+                except OSError:
+                    continue
+                
+                for filename in filenames:
+                    if filename in entries:
+                        return os.path.join(directory, filename)
             
             return None
             
@@ -538,11 +1070,11 @@ class WPCImageWindow(QWidget):
             log_error(e, "get_movement_image_path")
             return None
     
-    def display_image(self, pixmap: QPixmap, movement_info: Optional[dict] = None):
+    def display_image(self, image: QImage, movement_info: Optional[dict] = None):
         """Mostrar imagen en el widget principal"""
         if movement_info is None:
             movement_info = {}
-        self.image_widget.set_image(pixmap, movement_info)
+        self.image_widget.set_image(image, movement_info)
 
     def show_error(self, message: str):
         """Mostrar mensaje de error en la interfaz"""
@@ -554,9 +1086,9 @@ class WPCImageWindow(QWidget):
         try:
             file_path = Path(image_path)
             if file_path.exists():
-                pixmap = QPixmap(str(file_path))
-                if not pixmap.isNull():
-                    self.display_image(pixmap)
+                image = QImage(str(file_path))
+                if not image.isNull():
+                    self.display_image(image)
                     self.update_image_info(str(file_path))
                 else:
                     self.show_error("Error cargando imagen")
@@ -630,13 +1162,14 @@ class WPCImageWindow(QWidget):
         """Actualizar imagen actual"""
         # Recargar la última imagen mostrada
         if hasattr(self, 'current_movement_id'):
+            # Forzar nueva lectura desde disco
             self.show_movement_image(self.current_movement_id)
         else:
             self.status_label.setText("No hay imagen para actualizar")
     
-    def on_image_loaded(self, pixmap: QPixmap, movement_info: dict):
+    def on_image_loaded(self, image: QImage, movement_info: dict):
         """Manejar imagen cargada exitosamente"""
-        self.image_widget.set_image(pixmap, movement_info)
+        self.image_widget.set_image(image, movement_info)
         self.status_label.setText("Imagen cargada")
     
     def on_image_load_failed(self, error_message: str):
@@ -655,10 +1188,26 @@ class WPCImageWindow(QWidget):
             # Detener timer de auto-close
             self.auto_close_timer.stop()
             
-            # Detener loader de imágenes
-            if self.image_loader.isRunning():
-                self.image_loader.terminate()
-                self.image_loader.wait(3000)  # Esperar 3 segundos máximo
+            if self.reusable:
+                # Solo ocultar: liberar la imagen pero conservar loader y timer
+                self.image_loader.discard_pending()
+                self.image_widget.clear_image()
+                self.window_closed.emit(self.window_type)
+                event.accept()
+                return
+            
+            try:
+                self.auto_close_timer.timeout.disconnect()
+            except TypeError:
+                pass  # Ya desconectado
+            
+            # Detener loader de imágenes y descartar resultados en cola
+            self.image_loader.discard_pending()
+            self.image_loader.stop()
+            
+            # Liberar buffers de imagen (una imagen 4K RGBA ocupa ~32 MB)
+            self.image_widget.clear_image()
+            self._mv_cache.clear()
             
             # Emitir señal de cierre
             self.window_closed.emit(self.window_type)
@@ -674,7 +1223,8 @@ class WPCImageWindow(QWidget):
 def create_image_window(window_type: int = 1,
                         movement_id: Optional[int] = None,
                         image_path: Optional[str] = None,
-                        camera_manager: Optional[HikvisionManager] = None) -> WPCImageWindow:
+                        camera_manager: Optional[HikvisionManager] = None,
+                        reusable: bool = False) -> WPCImageWindow:
     """
     Crear ventana de imagen
     
@@ -683,6 +1233,7 @@ def create_image_window(window_type: int = 1,
         movement_id: ID del movimiento a mostrar (opcional)
         image_path: Ruta de imagen a cargar directamente (opcional)
         camera_manager: Gestor de cámaras a reutilizar (opcional)
+        reusable: Si True, cerrar solo oculta la ventana para reutilizarla
         
     Returns:
         Instancia de WPCImageWindow
@@ -692,6 +1243,7 @@ def create_image_window(window_type: int = 1,
         movement_id=movement_id,
         image_path=image_path,
         camera_manager=camera_manager,
+        reusable=reusable,
     )
     
     return window
@@ -4,20 +4,23 @@ Ventana principal del sistema WPC
 Equivalente a CACommMain.frm en VB6
 """
 import sys
+import time
 import asyncio
+from collections import deque
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QPushButton, QFrame, QScrollArea, QTextEdit, QStatusBar,
+    QLabel, QPushButton, QFrame, QScrollArea, QListView, QStatusBar,
     QMenuBar, QMenu, QMessageBox, QSplitter, QGroupBox, QApplication
 )
 from PyQt6.QtCore import (
-    QTimer, QThread, pyqtSignal, Qt, QSize
+    QTimer, pyqtSignal, Qt, QSize, QRectF, QAbstractListModel, QModelIndex
 )
 from PyQt6.QtGui import (
-    QPixmap, QIcon, QFont, QColor, QPalette, QAction
+    QPixmap, QIcon, QFont, QColor, QBrush, QPalette, QAction, QPainter
 )
 
 from core.communication.polling import PollingManager, ModuleStatus
@@ -29,6 +32,82 @@ from utils.logger import log_system, log_error
 from camera_integration.hikvision_manager import HikvisionManager
 from ui.widgets import StatusLED
 
+@lru_cache(maxsize=None)
+def _font(family: str, size: int, bold: bool = False) -> QFont:
+    """
+    Fuente compartida entre widgets (se construye una sola vez por variante)
+    
+    Se crea bajo demanda porque QFont necesita una QGuiApplication activa.
+    """
+    if bold:
+        return QFont(family, size, QFont.Weight.Bold)
+    return QFont(family, size)
+
+# Estilos de ModuleWidget por estado, seleccionados con la propiedad "state".
+# Se instalan una sola vez en la ventana principal
+_STYLE_MODULES = """
+    QFrame[state] {
+        border: 2px solid #808080;
+        border-radius: 8px;
+        background-color: #f5f5f5;
+    }
+    QFrame[state]:hover {
+        border-color: #0078d4;
+    }
+    QFrame[state="online"] {
+        border-color: #00aa00;
+        background-color: #f0fff0;
+    }
+    QFrame[state="error"] {
+        border-color: #ff0000;
+        background-color: #fff0f0;
+    }
+"""
+
+# Colores de los LEDs de módulo
+_LED_COLORS = {
+    "green": "#00ff00",
+    "red": "#ff0000",
+    "gray": "#808080",
+    "yellow": "#ffff00",
+}
+_LED_SIZE = 16
+
+@lru_cache(maxsize=None)
+def _led_pixmap(glyph: str, color: str, ratio: float = 1.0) -> QPixmap:
+    """
+    LED pre-renderizado (forma x color x escala), compartido por todos los módulos
+    
+    Cambiar de LED es solo un setPixmap: sin rasterizar el glifo ni
+    recalcular estilos en cada actualización.
+    
+    Args:
+        glyph: Forma del LED ("●", "■", "▲")
+        color: Nombre del color en _LED_COLORS
+        ratio: Relación de píxeles del dispositivo (HiDPI)
+        
+    Returns:
+        Pixmap de _LED_SIZE x _LED_SIZE lógicos con fondo transparente,
+        rasterizado a la resolución física de la pantalla
+    """
+    physical_size = round(_LED_SIZE * ratio)
+    pixmap = QPixmap(physical_size, physical_size)
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    
+    painter = QPainter(pixmap)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(_font("Arial", 12))
+        painter.setPen(QColor(_LED_COLORS[color]))
+        # Coordenadas lógicas: QPainter aplica la escala del pixmap
+        painter.drawText(QRectF(0, 0, _LED_SIZE, _LED_SIZE),
+                         Qt.AlignmentFlag.AlignCenter, glyph)
+    finally:
+        painter.end()
+    
+    return pixmap
+
 class ModuleWidget(QFrame):
     """
     Widget que representa un módulo individual
@@ -39,6 +118,17 @@ class ModuleWidget(QFrame):
     module_clicked = pyqtSignal(int)  # module_id
     barrier_toggle_requested = pyqtSignal(int)  # module_id
     
+    # Colores del estado textual (se aplican por paleta, sin QSS)
+    _DARK_GREEN = QColor(0x00, 0x80, 0x00)
+    _RED = QColor(0xff, 0x00, 0x00)
+    _GRAY = QColor(0x80, 0x80, 0x80)
+    
+    # Valor de la propiedad dinámica "state" por estado (ver _STYLE_MODULES)
+    _STATE_PROPERTY = {
+        ModuleState.ONLINE: "online",
+        ModuleState.ERROR: "error",
+    }
+    
     def __init__(self, module_id: int, module_name: str, address: int):
         super().__init__()
         
@@ -47,6 +137,11 @@ class ModuleWidget(QFrame):
         self.address = address
         self.current_state = ModuleState.OFFLINE
         
+        # Último estado aplicado. ModuleStatus se modifica en el lugar desde el
+        # polling, por eso se guarda una copia de los campos y no el objeto
+        self._last_status: tuple = ()
+        self._last_appearance: Optional[ModuleState] = None
+        
         self.setup_ui()
         self.update_appearance()
     
@@ -55,16 +150,6 @@ class ModuleWidget(QFrame):
         self.setFrameStyle(QFrame.Shape.StyledPanel)
         self.setMinimumSize(120, 100)
         self.setMaximumSize(120, 100)
-        self.setStyleSheet("""
-            QFrame {
-                border: 2px solid #555555;
-                border-radius: 8px;
-                background-color: #f0f0f0;
-            }
-            QFrame:hover {
-                border-color: #0078d4;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
@@ -73,37 +158,28 @@ class ModuleWidget(QFrame):
         # Nombre del módulo
         self.name_label = QLabel(self.module_name)
         self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.name_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+        self.name_label.setFont(_font("Arial", 9, bold=True))
         layout.addWidget(self.name_label)
         
         # Dirección
         self.address_label = QLabel(f"Addr: {self.address}")
         self.address_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.address_label.setFont(QFont("Arial", 8))
+        self.address_label.setFont(_font("Arial", 8))
         layout.addWidget(self.address_label)
         
         # Indicadores de estado
         indicators_layout = QHBoxLayout()
         
         # LED de comunicación
-        self.comm_led = QLabel("●")
-        self.comm_led.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.comm_led.setFont(QFont("Arial", 12))
-        self.comm_led.setToolTip("Estado de comunicación")
+        self.comm_led = self._create_led("●", "Estado de comunicación")
         indicators_layout.addWidget(self.comm_led)
         
         # LED de barrera
-        self.barrier_led = QLabel("■")
-        self.barrier_led.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.barrier_led.setFont(QFont("Arial", 12))
-        self.barrier_led.setToolTip("Estado de barrera")
+        self.barrier_led = self._create_led("■", "Estado de barrera")
         indicators_layout.addWidget(self.barrier_led)
         
         # LED de sensor
-        self.sensor_led = QLabel("▲")
-        self.sensor_led.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.sensor_led.setFont(QFont("Arial", 12))
-        self.sensor_led.setToolTip("Sensor DDMM")
+        self.sensor_led = self._create_led("▲", "Sensor DDMM")
         indicators_layout.addWidget(self.sensor_led)
         
         layout.addLayout(indicators_layout)
@@ -111,7 +187,7 @@ class ModuleWidget(QFrame):
         # Estado textual
         self.status_label = QLabel("OFFLINE")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_label.setFont(QFont("Arial", 8))
+        self.status_label.setFont(_font("Arial", 8))
         layout.addWidget(self.status_label)
     
     def update_state(self, module_status: ModuleStatus):
@@ -121,73 +197,93 @@ class ModuleWidget(QFrame):
         Args:
             module_status: Estado actual del módulo
         """
+        if not self.needs_update(module_status):
+            return
+        self._last_status = self.status_key(module_status)
+        
         self.current_state = module_status.state
         
         # Actualizar LEDs según estado
         if module_status.state == ModuleState.ONLINE:
-            self.comm_led.setStyleSheet("color: #00ff00;")  # Verde
+            self.comm_led.setPixmap(self._led("●", "green"))
             self.status_label.setText("ONLINE")
-            self.status_label.setStyleSheet("color: #008000;")
+            self._set_color(self.status_label, self._DARK_GREEN)
         elif module_status.state == ModuleState.ERROR:
-            self.comm_led.setStyleSheet("color: #ff0000;")  # Rojo
+            self.comm_led.setPixmap(self._led("●", "red"))
             self.status_label.setText("ERROR")
-            self.status_label.setStyleSheet("color: #ff0000;")
+            self._set_color(self.status_label, self._RED)
         else:
-            self.comm_led.setStyleSheet("color: #808080;")  # Gris
+            self.comm_led.setPixmap(self._led("●", "gray"))
             self.status_label.setText("OFFLINE")
-            self.status_label.setStyleSheet("color: #808080;")
+            self._set_color(self.status_label, self._GRAY)
         
         # Estado de barrera
         if module_status.barrier_state == BarrierState.OPEN:
-            self.barrier_led.setStyleSheet("color: #00ff00;")  # Verde - abierta
+            self.barrier_led.setPixmap(self._led("■", "green"))  # Abierta
         elif module_status.barrier_state == BarrierState.CLOSED:
-            self.barrier_led.setStyleSheet("color: #ff0000;")  # Rojo - cerrada
+            self.barrier_led.setPixmap(self._led("■", "red"))  # Cerrada
         else:
-            self.barrier_led.setStyleSheet("color: #ffff00;")  # Amarillo - moviendo
+            self.barrier_led.setPixmap(self._led("■", "yellow"))  # Moviendo
         
         # Estado de sensor
         if module_status.sensor_ddmm == SensorState.OCCUPIED:
-            self.sensor_led.setStyleSheet("color: #ff0000;")  # Rojo - ocupado
+            self.sensor_led.setPixmap(self._led("▲", "red"))  # Ocupado
         else:
-            self.sensor_led.setStyleSheet("color: #00ff00;")  # Verde - libre
+            self.sensor_led.setPixmap(self._led("▲", "green"))  # Libre
         
         self.update_appearance()
     
+    @staticmethod
+    def status_key(module_status: ModuleStatus) -> tuple:
+        """Campos de ModuleStatus que determinan la apariencia del widget"""
+        return (module_status.state, module_status.barrier_state,
+                module_status.sensor_ddmm)
+    
+    def needs_update(self, module_status: ModuleStatus) -> bool:
+        """
+        Indicar si el estado difiere del último mostrado
+        
+        Args:
+            module_status: Estado actual del módulo
+            
+        Returns:
+            bool: True si update_state cambiaría la apariencia
+        """
+        return self.status_key(module_status) != self._last_status
+    
+    def _led(self, glyph: str, color: str) -> QPixmap:
+        """LED pre-renderizado para la escala de la pantalla del widget"""
+        return _led_pixmap(glyph, color, round(self.devicePixelRatioF(), 2))
+    
+    @staticmethod
+    def _create_led(glyph: str, tooltip: str) -> QLabel:
+        """Crear etiqueta de LED de tamaño fijo, inicialmente en gris"""
+        led = QLabel()
+        led.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        led.setFixedSize(_LED_SIZE, _LED_SIZE)
+        led.setToolTip(tooltip)
+        led.setPixmap(_led_pixmap(glyph, "gray", round(led.devicePixelRatioF(), 2)))
+        return led
+    
+    @staticmethod
+    def _set_color(label: QLabel, color: QColor):
+        """Cambiar el color de texto de una etiqueta vía paleta (sin reparsear QSS)"""
+        palette = label.palette()
+        palette.setColor(QPalette.ColorRole.WindowText, color)
+        label.setPalette(palette)
+    
     def update_appearance(self):
         """Actualizar apariencia general"""
-        if self.current_state == ModuleState.ONLINE:
-            self.setStyleSheet("""
-                QFrame {
-                    border: 2px solid #00aa00;
-                    border-radius: 8px;
-                    background-color: #f0fff0;
-                }
-                QFrame:hover {
-                    border-color: #0078d4;
-                }
-            """)
-        elif self.current_state == ModuleState.ERROR:
-            self.setStyleSheet("""
-                QFrame {
-                    border: 2px solid #ff0000;
-                    border-radius: 8px;
-                    background-color: #fff0f0;
-                }
-                QFrame:hover {
-                    border-color: #0078d4;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    border: 2px solid #808080;
-                    border-radius: 8px;
-                    background-color: #f5f5f5;
-                }
-                QFrame:hover {
-                    border-color: #0078d4;
-                }
-            """)
+        if self.current_state == self._last_appearance:
+            return
+        self._last_appearance = self.current_state
+        
+        # Los estilos viven en la hoja de la ventana principal: cambiar la
+        # propiedad y repolishar solo este marco, sin reparsear QSS
+        self.setProperty("state", self._STATE_PROPERTY.get(self.current_state, "offline"))
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
     
     def mousePressEvent(self, event):
         """Manejar clic en el módulo"""
@@ -208,10 +304,8 @@ class SystemStatusWidget(QGroupBox):
         super().__init__("Estado del Sistema")
         self.setup_ui()
         
-        # Timer para actualizar estadísticas
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_statistics)
-        self.update_timer.start(2000)  # Cada 2 segundos
+        # Sin timer propio: update_statistics no hace nada todavía. Cuando se
+        # implemente, debe llamarse desde el timer principal de WPCMainWindow.
     
     def setup_ui(self):
         """Configurar interfaz"""
@@ -241,36 +335,117 @@ class SystemStatusWidget(QGroupBox):
         except Exception as e:
             log_error(e, "SystemStatusWidget.update_statistics")
 
+class LogModel(QAbstractListModel):
+    """
+    Modelo de lista acotado para el log de eventos
+    
+    Cada fila es (texto, nivel). La vista solo pinta las filas visibles y el
+    color sale de ForegroundRole, sin HTML ni QTextDocument.
+    """
+    
+    def __init__(self, max_rows: int, colors: Dict[str, QBrush], default_color: QBrush):
+        super().__init__()
+        self._rows = deque()
+        self._max_rows = max_rows
+        self._colors = colors
+        self._default_color = default_color
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][0]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._colors.get(self._rows[index.row()][1], self._default_color)
+        return None
+    
+    def append_rows(self, rows: list):
+        """
+        Agregar filas al final descartando las más antiguas sobre el máximo
+        
+        Args:
+            rows: Lista de tuplas (texto, nivel)
+        """
+        rows = rows[-self._max_rows:]
+        if not rows:
+            return
+        
+        overflow = len(self._rows) + len(rows) - self._max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+    
+    def clear(self):
+        """Eliminar todas las filas"""
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
 class EventLogWidget(QGroupBox):
     """
     Widget de log de eventos en tiempo real
     Equivalente al área de mensajes en VB6
     """
     
+    # Color según nivel
+    COLOR_MAP = {
+        "INFO": "#ffffff",
+        "WARNING": "#ffaa00",
+        "ERROR": "#ff4444",
+        "SUCCESS": "#44ff44"
+    }
+    
+    # Pinceles ya construidos: ForegroundRole los entrega sin convertir
+    _COLORS = {level: QBrush(QColor(color)) for level, color in COLOR_MAP.items()}
+    
     def __init__(self):
         super().__init__("Log de Eventos")
-        self.setup_ui()
         self.max_lines = 100
+        self.setup_ui()
+        
+        # Entradas pendientes, volcadas en lote a ~20 Hz
+        self._pending = deque(maxlen=self.max_lines)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush)
     
     def setup_ui(self):
         """Configurar interfaz"""
         layout = QVBoxLayout(self)
         
-        self.log_text = QTextEdit()
-        self.log_text.setMaximumHeight(200)
-        self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Consolas", 9))
+        self._model = LogModel(self.max_lines, self._COLORS, self._COLORS["INFO"])
+        
+        self.log_view = QListView()
+        self.log_view.setModel(self._model)
+        self.log_view.setMaximumHeight(200)
+        self.log_view.setFont(_font("Consolas", 9))
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.log_view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.log_view.setSelectionMode(QListView.SelectionMode.NoSelection)
         
         # Estilo del log
-        self.log_text.setStyleSheet("""
-            QTextEdit {
+        self.log_view.setStyleSheet("""
+            QListView {
                 background-color: #1e1e1e;
                 color: #ffffff;
                 border: 1px solid #555555;
             }
         """)
         
-        layout.addWidget(self.log_text)
+        layout.addWidget(self.log_view)
         
         # Botones de control
         buttons_layout = QHBoxLayout()
@@ -298,38 +473,33 @@ class EventLogWidget(QGroupBox):
         if self.pause_button.isChecked():
             return
         
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
         
-        # Color según nivel
-        color_map = {
-            "INFO": "#ffffff",
-            "WARNING": "#ffaa00", 
-            "ERROR": "#ff4444",
-            "SUCCESS": "#44ff44"
-        }
-        color = color_map.get(level, "#ffffff")
-        
-        # Formatear mensaje
-        formatted_message = f'<span style="color: {color}">[{timestamp}] {level}: {message}</span>'
+        # Encolar; el volcado al modelo se hace en _flush
+        self._pending.append((f"[{timestamp}] {level}: {message}", level))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """Volcar las entradas pendientes al modelo en una sola inserción"""
+        if not self._pending:
+            return
         
-        # Agregar al log
-        self.log_text.append(formatted_message)
+        # Seguir el final solo si el usuario no se desplazó hacia arriba
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
         
-        # Limitar número de líneas
-        lines = self.log_text.toPlainText().split('\n')
-        if len(lines) > self.max_lines:
-            # Remover líneas más antiguas
-            self.log_text.clear()
-            for line in lines[-self.max_lines:]:
-                self.log_text.append(line)
+        self._model.append_rows(list(self._pending))
+        self._pending.clear()
         
         # Scroll al final
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        if at_bottom:
+            self.log_view.scrollToBottom()
     
     def clear_log(self):
         """Limpiar el log"""
-        self.log_text.clear()
+        self._pending.clear()
+        self._model.clear()
 
 class WPCMainWindow(QMainWindow):
     """
@@ -337,6 +507,15 @@ class WPCMainWindow(QMainWindow):
     Equivalente a CACommMain.frm en VB6
     """
     
+    # Refresco de seguridad: la UI se actualiza por eventos del polling, el
+    # timer cubre lo que no notifica (cámaras, estado de BD) y sirve de respaldo
+    UI_HEARTBEAT_MS = 5000
+    
+    # Eventos del polling reenviados al hilo de UI
+    movement_signal = pyqtSignal(str, object, object)  # identification, module_status, person
+    module_state_signal = pyqtSignal(object, object)  # module_status, state
+    serial_state_signal = pyqtSignal()
+    
     def __init__(self, polling_manager: Optional[PollingManager] = None,
                  module_manager: Optional[ModuleManager] = None,
                  camera_manager: Optional['HikvisionManager'] = None):
@@ -350,12 +529,27 @@ class WPCMainWindow(QMainWindow):
         
         # Widgets de módulos
         self.module_widgets: Dict[int, ModuleWidget] = {}
+        self.widgets_by_address: Dict[int, ModuleWidget] = {}
+        
+        # Ventana de imagen de eventos (se crea al primer movimiento)
+        self._movement_window = None
         
         # Configurar interfaz
         self.setup_ui()
         self.setup_menus()
         self.setup_status_bar()
         
+        # Subsistemas que necesitan redibujarse en el próximo tick
+        self._status_dirty = True
+        self._modules_dirty = True
+        self._cameras_dirty = True
+        
+        # Agrupa varias marcas sucesivas en una sola actualización
+        self._update_soon_timer = QTimer(self)
+        self._update_soon_timer.setSingleShot(True)
+        self._update_soon_timer.setInterval(50)
+        self._update_soon_timer.timeout.connect(self.update_ui)
+        
         # Configurar conexiones con el sistema
         self.setup_connections()
 
@@ -365,8 +559,8 @@ class WPCMainWindow(QMainWindow):
         
         # Timer principal (equivalente al timer de VB6)
         self.main_timer = QTimer()
-        self.main_timer.timeout.connect(self.update_ui)
-        self.main_timer.start(1000)  # Cada segundo
+        self.main_timer.timeout.connect(self._on_heartbeat)
+        self.main_timer.start(self.UI_HEARTBEAT_MS)
         
         # Cargar módulos
         self.load_modules()
@@ -377,6 +571,9 @@ class WPCMainWindow(QMainWindow):
         self.setMinimumSize(1000, 700)
         self.resize(1200, 800)
         
+        # Estilos de módulos por estado (se parsean una sola vez)
+        self.setStyleSheet(_STYLE_MODULES)
+        
         # Widget central
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -412,17 +609,21 @@ class WPCMainWindow(QMainWindow):
         scroll_area.setWidgetResizable(True)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.modules_scroll_area = scroll_area
         
         # Widget contenedor de módulos con grid layout
-        self.modules_container = QWidget()
-        self.modules_layout = QGridLayout(self.modules_container)
-        self.modules_layout.setSpacing(10)
-        
-        scroll_area.setWidget(self.modules_container)
+        self._create_modules_container()
         layout.addWidget(scroll_area)
         
         return panel
     
+    def _create_modules_container(self):
+        """Crear el contenedor (con grid layout) de los widgets de módulos"""
+        self.modules_container = QWidget()
+        self.modules_layout = QGridLayout(self.modules_container)
+        self.modules_layout.setSpacing(10)
+        self.modules_scroll_area.setWidget(self.modules_container)
+    
     def create_info_panel(self) -> QWidget:
         """Crear panel de información"""
         panel = QWidget()
@@ -494,10 +695,20 @@ class WPCMainWindow(QMainWindow):
     
     def setup_connections(self):
         """Configurar conexiones con el sistema de polling"""
+        # Los eventos del polling pueden llegar desde otro hilo: los widgets
+        # solo se tocan en los manejadores conectados en forma encolada
+        self.movement_signal.connect(self._handle_movement_ui,
+                                     Qt.ConnectionType.QueuedConnection)
+        self.module_state_signal.connect(self._handle_module_state_ui,
+                                         Qt.ConnectionType.QueuedConnection)
+        self.serial_state_signal.connect(self._handle_serial_state_ui,
+                                         Qt.ConnectionType.QueuedConnection)
+        
         if self.polling_manager:
             # Suscribirse a eventos del polling
             self.polling_manager.subscribe_to_event('movement_detected', self.on_movement_detected)
             self.polling_manager.subscribe_to_event('module_state_changed', self.on_module_state_changed)
+            self.polling_manager.subscribe_to_event('serial_state_changed', self.on_serial_state_changed)
     
     def load_modules(self):
         """Cargar módulos desde la configuración"""
@@ -516,26 +727,38 @@ class WPCMainWindow(QMainWindow):
             row, col = 0, 0
             max_cols = 6  # Máximo 6 columnas
             
-            for config in modules_config:
-                module_widget = ModuleWidget(
-                    config.module_id,
-                    config.name,
-                    config.address
-                )
-                
-                # Conectar señales
-                module_widget.module_clicked.connect(self.on_module_clicked)
-                module_widget.barrier_toggle_requested.connect(self.on_barrier_toggle_requested)
-                
-                # Agregar al layout
-                self.modules_layout.addWidget(module_widget, row, col)
-                self.module_widgets[config.module_id] = module_widget
-                
-                # Avanzar posición
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
+            # Inserción en bloque: un solo cálculo de geometría y repintado al final
+            self.modules_container.setUpdatesEnabled(False)
+            self.modules_layout.setEnabled(False)
+            self.modules_layout.blockSignals(True)
+            try:
+                for config in modules_config:
+                    module_widget = ModuleWidget(
+                        config.module_id,
+                        config.name,
+                        config.address
+                    )
+                    
+                    # Conectar señales
+                    module_widget.module_clicked.connect(self.on_module_clicked)
+                    module_widget.barrier_toggle_requested.connect(self.on_barrier_toggle_requested)
+                    
+                    # Agregar al layout
+                    self.modules_layout.addWidget(module_widget, row, col)
+                    self.module_widgets[config.module_id] = module_widget
+                    self.widgets_by_address[config.address] = module_widget
+                    
+                    # Avanzar posición
+                    col += 1
+                    if col >= max_cols:
+                        col = 0
+                        row += 1
+            finally:
+                self.modules_layout.blockSignals(False)
+                self.modules_layout.setEnabled(True)
+                self.modules_layout.activate()
+                self.modules_container.setUpdatesEnabled(True)
+                self.modules_container.updateGeometry()
             
             self.log_widget.add_log_entry(f"Cargados {len(modules_config)} módulos", "SUCCESS")
             
@@ -545,36 +768,67 @@ class WPCMainWindow(QMainWindow):
     
     def clear_modules(self):
         """Limpiar widgets de módulos"""
-        for widget in self.module_widgets.values():
-            widget.deleteLater()
+        if self.module_widgets:
+            # Reemplazar el contenedor completo: Qt destruye el subárbol de
+            # módulos de una vez en lugar de un deleteLater por widget.
+            # takeWidget evita que setWidget borre el anterior de inmediato
+            old_container = self.modules_scroll_area.takeWidget()
+            self._create_modules_container()
+            if old_container is not None:
+                old_container.deleteLater()
         self.module_widgets.clear()
+        self.widgets_by_address.clear()
+    
+    def _on_heartbeat(self):
+        """Refresco periódico de lo que no notifica cambios"""
+        self._status_dirty = True
+        self._cameras_dirty = True
+        # Red de seguridad para módulos: update_state descarta lo que no cambió
+        self._modules_dirty = True
+        self.update_ui()
+    
+    def _schedule_update(self):
+        """Programar una actualización de la UI en breve (agrupando marcas)"""
+        if not self._update_soon_timer.isActive():
+            self._update_soon_timer.start()
     
     def update_ui(self):
         """Actualización periódica de la interfaz"""
         try:
             # Actualizar barra de estado
-            self.update_status_bar()
+            if self._status_dirty:
+                self._status_dirty = False
+                self.update_status_bar()
             
             # Actualizar estado de módulos
-            self.update_modules_status()
+            if self._modules_dirty:
+                self._modules_dirty = False
+                self.update_modules_status()
 
             # Actualizar estado de cámaras
-            self.update_camera_status()
+            if self._cameras_dirty:
+                self._cameras_dirty = False
+                self.update_camera_status()
             
         except Exception as e:
             log_error(e, "update_ui")
     
     def update_status_bar(self):
         """Actualizar barra de estado"""
+        # Instantánea del estado del polling para este tick
+        polling_manager = self.polling_manager
+        serial_comm = polling_manager.serial_comm if polling_manager else None
+        is_running = bool(polling_manager and polling_manager.is_running)
+        
         # Estado de comunicación
-        if self.polling_manager and self.polling_manager.serial_comm:
-            if self.polling_manager.serial_comm.is_initialized:
-                self.comm_status_label.setText(f"Puerto: {self.polling_manager.serial_comm.config.port} - Conectado")
+        if serial_comm:
+            if serial_comm.is_initialized:
+                self.comm_status_label.setText(f"Puerto: {serial_comm.config.port} - Conectado")
             else:
                 self.comm_status_label.setText("Puerto: Desconectado")
         
         # Estado de polling
-        if self.polling_manager and self.polling_manager.is_running:
+        if is_running:
             self.polling_status_label.setText("Polling: Activo")
         else:
             self.polling_status_label.setText("Polling: Detenido")
@@ -590,17 +844,24 @@ class WPCMainWindow(QMainWindow):
         try:
             modules_status = self.polling_manager.get_all_modules_status()
             
+            # Solo los módulos cuyo estado cambió desde la última pasada
+            changed = []
             for address, module_status in modules_status.items():
-                module_widget = None
-                
-                # Buscar widget por module_id
-                for widget in self.module_widgets.values():
-                    if widget.address == address:
-                        module_widget = widget
-                        break
-                
-                if module_widget:
+                module_widget = self.widgets_by_address.get(address)
+                if module_widget and module_widget.needs_update(module_status):
+                    changed.append((module_widget, module_status))
+            
+            if not changed:
+                return
+            
+            # Varios módulos pueden cambiar a la vez (p.ej. al volver el puerto
+            # serie): un solo repintado para todos
+            self.modules_container.setUpdatesEnabled(False)
+            try:
+                for module_widget, module_status in changed:
                     module_widget.update_state(module_status)
+            finally:
+                self.modules_container.setUpdatesEnabled(True)
                     
         except Exception as e:
             log_error(e, "update_modules_status")
@@ -646,7 +907,9 @@ class WPCMainWindow(QMainWindow):
             if not self.camera_manager:
                 return
 
-            stats = self.camera_manager.get_system_statistics()
+            # Una sola consulta de estados por tick, compartida por stats y LEDs
+            statuses = self.camera_manager.get_all_device_status()
+            stats = self.camera_manager.get_system_statistics(statuses)
             stats_text = (
                 f"Dispositivos: {stats.get('online_devices', 0)}/"
                 f"{stats.get('total_devices', 0)} | "
@@ -657,9 +920,7 @@ class WPCMainWindow(QMainWindow):
             for module_id, led in self.camera_leds.items():
                 camera_config = self.camera_manager.module_cameras.get(module_id)
                 if camera_config:
-                    device_status = self.camera_manager.get_device_status(
-                        camera_config.device_id
-                    )
+                    device_status = statuses.get(camera_config.device_id, {})
                     if device_status.get("status") == "online":
                         led.set_state('online')
                     else:
@@ -684,39 +945,75 @@ class WPCMainWindow(QMainWindow):
     def show_movement_image(self, movement_id: int, image_path: str):
         """Mostrar imagen de movimiento en ventana flotante"""
         try:
-            from ui.image_window import create_image_window
-
-            image_window = create_image_window(
-                window_type=2,
-                movement_id=movement_id
-            )
+            # Una única ventana de evento, creada la primera vez y reutilizada:
+            # ráfagas de movimientos solo cambian su contenido
+            if self._movement_window is None:
+                from ui.image_window import create_image_window
+                
+                self._movement_window = create_image_window(window_type=2, reusable=True)
+            
+            image_window = self._movement_window
+            image_window.movement_id = movement_id
 
-            if hasattr(image_window, 'image_loader'):
+            if image_path:
+                # Imagen recién capturada: cargarla directamente, sin consultar
+                # la base, reemplazando los datos del evento anterior
                 movement_info = {
                     'movement_time': datetime.now(),
                     'module_name': f'Módulo {movement_id}',
                 }
+                image_window.current_movement_id = movement_id
+                image_window.update_movement_info(movement_info)
+                image_window.status_label.setText("Cargando imagen...")
                 image_window.image_loader.load_image(movement_id, image_path, movement_info)
-
+            else:
+                # Sin ruta: la ventana resuelve detalles e imagen en su loader
+                image_window.show_movement_image(movement_id)
+            
             image_window.show()
-
-            QTimer.singleShot(10000, image_window.close)
+            image_window.raise_()
+            
+            # Rearmar el auto-cierre de la ventana en lugar de crear otro timer
+            image_window.auto_close_timer.start(10000)
 
         except Exception as e:
             log_error(e, f"show_movement_image(movement_id={movement_id})")
     
     # Slots para eventos
     async def on_movement_detected(self, identification: str, module_status: ModuleStatus, person=None):
-        """Manejar detección de movimiento"""
+        """Manejar detección de movimiento (solo reenvía al hilo de UI)"""
+        self.movement_signal.emit(identification, module_status, person)
+    
+    async def on_module_state_changed(self, module_status: ModuleStatus):
+        """Manejar cambio de estado de módulo (solo reenvía al hilo de UI)"""
+        # El estado se captura ahora: el polling modifica module_status en el lugar
+        self.module_state_signal.emit(module_status, module_status.state)
+    
+    def _handle_movement_ui(self, identification: str, module_status: ModuleStatus, person=None):
+        """Registrar movimiento detectado (hilo de UI)"""
         person_name = person.full_name if person else "Desconocido"
         message = f"Movimiento detectado: {identification} ({person_name}) en {module_status.name}"
         self.log_widget.add_log_entry(message, "SUCCESS")
+        self._modules_dirty = True
+        self._cameras_dirty = True
+        self._schedule_update()
     
-    async def on_module_state_changed(self, module_status: ModuleStatus):
-        """Manejar cambio de estado de módulo"""
-        message = f"Módulo {module_status.name}: {module_status.state.name}"
-        level = "SUCCESS" if module_status.state == ModuleState.ONLINE else "WARNING"
+    def _handle_module_state_ui(self, module_status: ModuleStatus, state: ModuleState):
+        """Registrar cambio de estado de módulo (hilo de UI)"""
+        message = f"Módulo {module_status.name}: {state.name}"
+        level = "SUCCESS" if state == ModuleState.ONLINE else "WARNING"
         self.log_widget.add_log_entry(message, level)
+        self._modules_dirty = True
+        self._schedule_update()
+    
+    async def on_serial_state_changed(self):
+        """Manejar cambio de estado del puerto serie (solo reenvía al hilo de UI)"""
+        self.serial_state_signal.emit()
+    
+    def _handle_serial_state_ui(self):
+        """Refrescar barra de estado tras un cambio del puerto (hilo de UI)"""
+        self._status_dirty = True
+        self._schedule_update()
     
     def on_module_clicked(self, module_id: int):
         """Manejar clic en módulo"""
@@ -747,6 +1044,8 @@ class WPCMainWindow(QMainWindow):
         if self.polling_manager:
             if not self.polling_manager.is_running:
                 self.polling_manager.start()
+                self._status_dirty = True
+                self._schedule_update()
                 self.log_widget.add_log_entry("Polling iniciado", "SUCCESS")
             else:
                 self.log_widget.add_log_entry("Polling ya está activo", "WARNING")
@@ -756,6 +1055,8 @@ class WPCMainWindow(QMainWindow):
         if self.polling_manager:
             if self.polling_manager.is_running:
                 self.polling_manager.stop()
+                self._status_dirty = True
+                self._schedule_update()
                 self.log_widget.add_log_entry("Polling detenido", "WARNING")
             else:
                 self.log_widget.add_log_entry("Polling ya está detenido", "INFO")
@@ -792,6 +1093,12 @@ class WPCMainWindow(QMainWindow):
             if self.polling_manager and self.polling_manager.is_running:
                 self.polling_manager.stop()
             
+            # Cerrar definitivamente la ventana de eventos (detiene su loader)
+            if self._movement_window is not None:
+                self._movement_window.reusable = False
+                self._movement_window.close()
+                self._movement_window = None
+            
             self.log_widget.add_log_entry("Sistema cerrando...", "INFO")
             event.accept()
         else:
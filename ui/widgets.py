@@ -2,18 +2,22 @@
 """
 Widgets comunes reutilizables para la interfaz WPC
 """
+import time
+from collections import deque
+from functools import lru_cache
 from typing import Optional, Dict, List, Callable, Any
 from datetime import datetime, timedelta
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
     QLineEdit, QComboBox, QSpinBox, QCheckBox, QProgressBar, QFrame,
-    QGroupBox, QListWidget, QListWidgetItem, QTableWidget, QTableWidgetItem,
+    QGroupBox, QListView, QTableView,
     QHeaderView, QMessageBox, QDialog, QDialogButtonBox, QDateTimeEdit,
     QTextEdit, QScrollArea, QSplitter, QTabWidget
 )
 from PyQt6.QtCore import (
-    Qt, QTimer, pyqtSignal, QDateTime, QSize, QPropertyAnimation, QEasingCurve,
-    QRect, QSequentialAnimationGroup, QParallelAnimationGroup
+    Qt, QObject, QTimer, pyqtSignal, QDateTime, QSize, QEasingCurve,
+    QRect, QParallelAnimationGroup,
+    QAbstractTableModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPalette, QPixmap, QIcon, QPainter, QPen, QBrush,
@@ -23,19 +27,121 @@ from PyQt6.QtGui import (
 from core.modules.module_types import ModuleState, BarrierState, SensorState
 from utils.logger import log_error
 
+@lru_cache(maxsize=None)
+def _font(family: str, size: int, bold: bool = False) -> QFont:
+    """
+    Fuente compartida entre widgets (se construye una sola vez por variante)
+    
+    Se crea bajo demanda porque QFont necesita una QGuiApplication activa.
+    """
+    if bold:
+        return QFont(family, size, QFont.Weight.Bold)
+    return QFont(family, size)
+
+# Último datetime.now() y el instante monotónico en que se tomó
+_last_now: Optional[tuple] = None
+_NOW_TOLERANCE = 0.001  # segundos
+
+def _now() -> datetime:
+    """
+    datetime.now() reutilizado dentro de una ventana de 1 ms
+    
+    En ráfagas de eventos evita una llamada a localtime por evento; la
+    precisión sobra para el formato %H:%M:%S con que se muestran.
+    """
+    global _last_now
+    monotonic_now = time.monotonic()
+    if _last_now is not None and monotonic_now - _last_now[0] < _NOW_TOLERANCE:
+        return _last_now[1]
+    
+    now = datetime.now()
+    _last_now = (monotonic_now, now)
+    return now
+
+# Colores de StatusLED por estado
+_LED_STATE_COLORS = {
+    'online': QColor(0, 255, 0),      # Verde
+    'offline': QColor(128, 128, 128), # Gris
+    'error': QColor(255, 0, 0),       # Rojo
+    'warning': QColor(255, 165, 0),   # Naranja
+    'active': QColor(0, 191, 255)     # Azul
+}
+
+# Fondos de la tabla de módulos
+_BRUSH_ONLINE = QBrush(QColor(200, 255, 200))     # Verde claro
+_BRUSH_ERROR = QBrush(QColor(255, 200, 200))      # Rojo claro
+_BRUSH_DEFAULT = QBrush(QColor(240, 240, 240))    # Gris claro
+_BRUSH_ERR_COUNT = QBrush(QColor(255, 220, 220))  # Rojo muy claro
+
+# Color de texto del visor de eventos según nivel
+_EVENT_LEVEL_BRUSHES = {
+    'INFO': QBrush(QColor(0, 0, 0)),
+    'WARNING': QBrush(QColor(255, 140, 0)),
+    'ERROR': QBrush(QColor(255, 0, 0)),
+    'SUCCESS': QBrush(QColor(0, 128, 0))
+}
+
+class _BlinkClock(QObject):
+    """
+    Reloj de parpadeo compartido por todos los LEDs
+    
+    Un único QTimer para todos los LEDs que parpadean: una sola activación
+    del event loop por ciclo y todos en fase.
+    """
+    
+    tick = pyqtSignal()
+    
+    INTERVAL_MS = 500
+    
+    _instance: Optional['_BlinkClock'] = None
+    
+    def __init__(self):
+        super().__init__()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self._on_timeout)
+    
+    @classmethod
+    def instance(cls) -> '_BlinkClock':
+        """Obtener el reloj compartido (se crea al primer uso)"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def register(self, slot: Callable):
+        """Suscribir un slot al tick y arrancar el timer si estaba detenido"""
+        self.tick.connect(slot)
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def unregister(self, slot: Callable):
+        """Cancelar la suscripción de un slot"""
+        try:
+            self.tick.disconnect(slot)
+        except TypeError:
+            pass  # Ya desconectado
+    
+    def _on_timeout(self):
+        # Sin suscriptores (p.ej. LEDs destruidos): detener el timer
+        if self.receivers(self.tick) == 0:
+            self._timer.stop()
+            return
+        self.tick.emit()
+
 class StatusLED(QLabel):
     """
     LED de estado personalizado
     """
     
+    # Pixmaps ya dibujados, compartidos por todos los LEDs: (tamaño, rgb) -> QPixmap
+    _pixmap_cache: Dict[tuple, QPixmap] = {}
+    
     def __init__(self, size: int = 16, parent=None):
         super().__init__(parent)
         
         self.led_size = size
         self.state_color = QColor(128, 128, 128)  # Gris por defecto
         self.is_blinking = False
-        self.blink_timer = QTimer()
-        self.blink_timer.timeout.connect(self.toggle_blink)
         
         self.setFixedSize(size, size)
         self.update_appearance()
@@ -48,21 +154,21 @@ class StatusLED(QLabel):
             state: Estado ('online', 'offline', 'error', 'warning')
             blinking: Si debe parpadear
         """
-        color_map = {
-            'online': QColor(0, 255, 0),      # Verde
-            'offline': QColor(128, 128, 128), # Gris
-            'error': QColor(255, 0, 0),       # Rojo
-            'warning': QColor(255, 165, 0),   # Naranja
-            'active': QColor(0, 191, 255)     # Azul
-        }
+        state_color = _LED_STATE_COLORS.get(state, _LED_STATE_COLORS['offline'])
         
-        self.state_color = color_map.get(state, QColor(128, 128, 128))
-        self.is_blinking = blinking
+        # Sin cambios: no reiniciar el timer ni volver a asignar el pixmap
+        if state_color == self.state_color and blinking == self.is_blinking:
+            return
+        
+        self.state_color = state_color
         
         if blinking:
-            self.blink_timer.start(500)  # Parpadear cada 500ms
-        else:
-            self.blink_timer.stop()
+            if not self.is_blinking:
+                _BlinkClock.instance().register(self.toggle_blink)
+        elif self.is_blinking:
+            _BlinkClock.instance().unregister(self.toggle_blink)
+            self.setVisible(True)  # No quedar oculto a mitad de parpadeo
+        self.is_blinking = blinking
         
         self.update_appearance()
     
@@ -72,26 +178,37 @@ class StatusLED(QLabel):
     
     def update_appearance(self):
         """Actualizar apariencia visual del LED"""
+        key = (self.led_size, self.state_color.rgb())
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = self._render_pixmap(self.led_size, self.state_color)
+            self._pixmap_cache[key] = pixmap
+        
+        self.setPixmap(pixmap)
+    
+    @staticmethod
+    def _render_pixmap(size: int, color: QColor) -> QPixmap:
+        """Dibujar el pixmap de un LED"""
         # Crear pixmap del LED
-        pixmap = QPixmap(self.led_size, self.led_size)
+        pixmap = QPixmap(size, size)
         pixmap.fill(Qt.GlobalColor.transparent)
         
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Crear gradiente para efecto 3D
-        gradient = QLinearGradient(0, 0, self.led_size, self.led_size)
-        gradient.setColorAt(0, self.state_color.lighter(150))
-        gradient.setColorAt(1, self.state_color.darker(150))
+        gradient = QLinearGradient(0, 0, size, size)
+        gradient.setColorAt(0, color.lighter(150))
+        gradient.setColorAt(1, color.darker(150))
         
         # Dibujar círculo del LED
         painter.setBrush(QBrush(gradient))
         painter.setPen(QPen(QColor(0, 0, 0), 1))
-        painter.drawEllipse(1, 1, self.led_size - 2, self.led_size - 2)
+        painter.drawEllipse(1, 1, size - 2, size - 2)
         
         painter.end()
         
-        self.setPixmap(pixmap)
+        return pixmap
 
 class ConnectionStatusWidget(QFrame):
     """
@@ -121,7 +238,7 @@ class ConnectionStatusWidget(QFrame):
         
         # Título
         title_label = QLabel(self.title)
-        title_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+        title_label.setFont(_font("Arial", 9, bold=True))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
@@ -142,7 +259,7 @@ class ConnectionStatusWidget(QFrame):
         led.set_state(initial_state)
         
         label_widget = QLabel(label)
-        label_widget.setFont(QFont("Arial", 8))
+        label_widget.setFont(_font("Arial", 8))
         
         row = len(self.connections)
         self.connections_layout.addWidget(led, row, 0)
@@ -155,7 +272,143 @@ class ConnectionStatusWidget(QFrame):
         if name in self.connections:
             self.connections[name].set_state(state, blinking)
 
-class ModuleStatusTable(QTableWidget):
+def _enum_name(value) -> str:
+    """Nombre de un valor enumerado (o su str si no es un enum)"""
+    return value.name if hasattr(value, 'name') else str(value)
+
+class ModuleTableModel(QAbstractTableModel):
+    """
+    Modelo de la tabla de módulos
+    
+    module_data es el almacén canónico; por cada fila se guardan además los
+    textos ya formateados, de modo que data() no formatea nada y una
+    actualización solo notifica las celdas que cambiaron.
+    """
+    
+    HEADERS = ["ID", "Nombre", "Dirección", "Estado", "Barrera", "Sensor", "Último OK", "Errores"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.module_data: Dict[int, dict] = {}  # module_id -> data
+        self._rows: List[tuple] = []  # (module_id, textos de las columnas)
+        self._row_by_id: Dict[int, int] = {}
+    
+    @staticmethod
+    def _cache_last_comm(data: dict):
+        """Formatear last_communication una sola vez, al asignarse"""
+        last_comm = data.get('last_communication', 'Nunca')
+        if isinstance(last_comm, datetime):
+            last_comm = last_comm.strftime("%H:%M:%S")
+        data['_last_comm_str'] = str(last_comm)
+    
+    @staticmethod
+    def _format_row(module_id: int, data: dict) -> tuple:
+        """Textos de cada columna para un módulo"""
+        get = data.get
+        enum_name = _enum_name
+        return (
+            str(module_id),
+            get('name', f'Módulo {module_id}'),
+            str(get('address', '--')),
+            enum_name(get('state', ModuleState.OFFLINE)),
+            enum_name(get('barrier_state', BarrierState.UNKNOWN)),
+            enum_name(get('sensor_state', SensorState.UNKNOWN)),
+            data['_last_comm_str'],
+            str(get('consecutive_errors', 0)),
+        )
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole and
+                orientation == Qt.Orientation.Horizontal):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        module_id, texts = self._rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return texts[column]
+        if role == Qt.ItemDataRole.UserRole:
+            return module_id
+        if role == Qt.ItemDataRole.BackgroundRole:
+            data = self.module_data[module_id]
+            if column == 3:
+                state = data.get('state', ModuleState.OFFLINE)
+                if state == ModuleState.ONLINE:
+                    return _BRUSH_ONLINE
+                if state == ModuleState.ERROR:
+                    return _BRUSH_ERROR
+                return _BRUSH_DEFAULT
+            if column == 7 and data.get('consecutive_errors', 0) > 0:
+                return _BRUSH_ERR_COUNT
+        return None
+    
+    def add_module(self, module_id: int, module_data: dict):
+        """Agregar un módulo (o reemplazar sus datos si ya existe)"""
+        self._cache_last_comm(module_data)
+        
+        if module_id in self._row_by_id:
+            self.module_data[module_id] = module_data
+            self._refresh_row(module_id, force=True)
+            return
+        
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.module_data[module_id] = module_data
+        self._rows.append((module_id, self._format_row(module_id, module_data)))
+        self._row_by_id[module_id] = row
+        self.endInsertRows()
+    
+    def update_module(self, module_id: int, status_data: dict):
+        """Combinar nuevos datos de estado de un módulo existente"""
+        data = self.module_data.get(module_id)
+        if data is None:
+            return
+        
+        # Solo los campos que realmente cambiaron; sin cambios no se
+        # reformatea la fila
+        changes = {key: value for key, value in status_data.items()
+                   if key not in data or data[key] != value}
+        if not changes:
+            return
+        
+        data.update(changes)
+        if 'last_communication' in changes:
+            self._cache_last_comm(data)
+        self._refresh_row(module_id)
+    
+    def _refresh_row(self, module_id: int, force: bool = False):
+        """Reformatear la fila y notificar solo el rango de columnas cambiadas"""
+        row = self._row_by_id[module_id]
+        old_texts = self._rows[row][1]
+        new_texts = self._format_row(module_id, self.module_data[module_id])
+        self._rows[row] = (module_id, new_texts)
+        
+        if force:
+            changed = list(range(len(new_texts)))
+        else:
+            changed = [column for column, (old, new) in enumerate(zip(old_texts, new_texts))
+                       if old != new]
+        if not changed:
+            return
+        
+        self.dataChanged.emit(
+            self.index(row, changed[0]), self.index(row, changed[-1]),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+        )
+
+class ModuleStatusTable(QTableView):
     """
     Tabla de estado de módulos con actualización automática
     """
@@ -163,135 +416,227 @@ class ModuleStatusTable(QTableWidget):
     module_selected = pyqtSignal(int)  # module_id
     module_double_clicked = pyqtSignal(int)  # module_id
     
+    # Ancho fijo por columna: evita recorrer todas las filas para medirlas
+    COLUMN_WIDTHS = [40, 120, 70, 80, 80, 80, 80, 60]
+    ROW_HEIGHT = 22
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        self.module_data = {}  # Dict[int, dict] - module_id -> data
+        self.table_model = ModuleTableModel(self)
+        
+        # Ordenamiento por columnas sin reordenar el modelo fuente
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
+        self.setModel(self.proxy_model)
         
         self.setup_table()
         self.setup_connections()
     
+    @property
+    def module_data(self) -> Dict[int, dict]:
+        """Datos de los módulos (module_id -> data)"""
+        return self.table_model.module_data
+    
     def setup_table(self):
         """Configurar estructura de la tabla"""
-        headers = ["ID", "Nombre", "Dirección", "Estado", "Barrera", "Sensor", "Último OK", "Errores"]
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
-        
         # Configurar columnas
         header = self.horizontalHeader()
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Nombre
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Estado
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)  # Último OK
+        
+        # Estado y Último OK con ancho fijo: ResizeToContents mediría todas
+        # las filas en cada cambio
+        for column in (3, 6):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            header.resizeSection(column, self.COLUMN_WIDTHS[column])
+        
+        # Filas de altura uniforme: Qt no mide cada fila
+        vertical_header = self.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.ROW_HEIGHT)
         
         # Configurar tabla
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.setAlternatingRowColors(True)
         self.setSortingEnabled(True)
     
+    def sizeHintForColumn(self, column: int) -> int:
+        """Ancho de columna fijo en lugar de medir todas las filas"""
+        if 0 <= column < len(self.COLUMN_WIDTHS):
+            return self.COLUMN_WIDTHS[column]
+        return super().sizeHintForColumn(column)
+    
     def setup_connections(self):
         """Configurar conexiones de señales"""
-        self.itemSelectionChanged.connect(self.on_selection_changed)
-        self.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.doubleClicked.connect(self.on_item_double_clicked)
     
     def add_module(self, module_id: int, module_data: dict):
         """Agregar módulo a la tabla"""
-        self.module_data[module_id] = module_data
-        self.update_table()
+        self.table_model.add_module(module_id, module_data)
     
     def update_module_status(self, module_id: int, status_data: dict):
         """Actualizar estado de un módulo"""
-        if module_id in self.module_data:
-            self.module_data[module_id].update(status_data)
-            self.update_table()
+        self.table_model.update_module(module_id, status_data)
     
-    def update_table(self):
-        """Actualizar contenido de la tabla"""
-        self.setRowCount(len(self.module_data))
+    def update_modules_status(self, statuses: Dict[int, dict]):
+        """
+        Actualizar el estado de varios módulos con un solo repintado
         
-        for row, (module_id, data) in enumerate(self.module_data.items()):
-            # ID
-            self.setItem(row, 0, QTableWidgetItem(str(module_id)))
-            
-            # Nombre
-            name_item = QTableWidgetItem(data.get('name', f'Módulo {module_id}'))
-            self.setItem(row, 1, name_item)
-            
-            # Dirección
-            address_item = QTableWidgetItem(str(data.get('address', '--')))
-            self.setItem(row, 2, address_item)
-            
-            # Estado con color
-            state = data.get('state', ModuleState.OFFLINE)
-            state_item = QTableWidgetItem(state.name if hasattr(state, 'name') else str(state))
-            
-            if state == ModuleState.ONLINE:
-                state_item.setBackground(QColor(200, 255, 200))  # Verde claro
-            elif state == ModuleState.ERROR:
-                state_item.setBackground(QColor(255, 200, 200))  # Rojo claro
-            else:
-                state_item.setBackground(QColor(240, 240, 240))  # Gris claro
-            
-            self.setItem(row, 3, state_item)
-            
-            # Estado de barrera
-            barrier_state = data.get('barrier_state', BarrierState.UNKNOWN)
-            barrier_item = QTableWidgetItem(barrier_state.name if hasattr(barrier_state, 'name') else str(barrier_state))
-            self.setItem(row, 4, barrier_item)
-            
-            # Estado de sensor
-            sensor_state = data.get('sensor_state', SensorState.UNKNOWN)
-            sensor_item = QTableWidgetItem(sensor_state.name if hasattr(sensor_state, 'name') else str(sensor_state))
-            self.setItem(row, 5, sensor_item)
-            
-            # Última comunicación
-            last_comm = data.get('last_communication', 'Nunca')
-            if isinstance(last_comm, datetime):
-                last_comm = last_comm.strftime("%H:%M:%S")
-            last_comm_item = QTableWidgetItem(str(last_comm))
-            self.setItem(row, 6, last_comm_item)
-            
-            # Errores consecutivos
-            errors = data.get('consecutive_errors', 0)
-            errors_item = QTableWidgetItem(str(errors))
-            if errors > 0:
-                errors_item.setBackground(QColor(255, 220, 220))  # Rojo muy claro
-            self.setItem(row, 7, errors_item)
-            
-            # Guardar module_id en la fila
-            self.item(row, 0).setData(Qt.ItemDataRole.UserRole, module_id)
+        Args:
+            statuses: module_id -> datos de estado
+        """
+        # Sin reordenar ni repintar por cada celda: una sola vez al final
+        self.setUpdatesEnabled(False)
+        self.proxy_model.setDynamicSortFilter(False)
+        try:
+            for module_id, status_data in statuses.items():
+                self.table_model.update_module(module_id, status_data)
+        finally:
+            self.proxy_model.setDynamicSortFilter(True)
+            self.proxy_model.invalidate()
+            self.setUpdatesEnabled(True)
     
     def on_selection_changed(self):
         """Manejar cambio de selección"""
-        current_row = self.currentRow()
-        if current_row >= 0:
-            module_id_item = self.item(current_row, 0)
-            if module_id_item:
-                module_id = module_id_item.data(Qt.ItemDataRole.UserRole)
+        index = self.currentIndex()
+        if index.isValid():
+            module_id = index.data(Qt.ItemDataRole.UserRole)
+            if module_id is not None:
                 self.module_selected.emit(module_id)
     
-    def on_item_double_clicked(self, item):
-        """Manejar doble clic en item"""
-        row = item.row()
-        module_id_item = self.item(row, 0)
-        if module_id_item:
-            module_id = module_id_item.data(Qt.ItemDataRole.UserRole)
+    def on_item_double_clicked(self, index: QModelIndex):
+        """Manejar doble clic en una celda"""
+        module_id = index.data(Qt.ItemDataRole.UserRole)
+        if module_id is not None:
             self.module_double_clicked.emit(module_id)
 
+class EventLogModel(QAbstractListModel):
+    """
+    Modelo del visor de eventos
+    
+    Guarda los eventos en un deque acotado y la lista de los que pasan el
+    filtro activo; el texto de cada fila se arma en data(), es decir, solo
+    para las filas que la vista realmente pinta.
+    """
+    
+    def __init__(self, max_entries: int, parent=None):
+        super().__init__(parent)
+        self._events = deque(maxlen=max_entries)
+        # Eventos que pasan el filtro, en orden. También un deque: al llenarse
+        # el log se descarta por la izquierda en O(1) en lugar de desplazar
+        # toda la lista
+        self._visible: deque = deque()
+        self._level_filter = "Todos"
+        self._text_filter = ""
+    
+    @property
+    def events(self) -> deque:
+        """Todos los eventos almacenados"""
+        return self._events
+    
+    @property
+    def visible_events(self) -> deque:
+        """Eventos que pasan el filtro activo"""
+        return self._visible
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        event = self._visible[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"[{event['_ts_str']}] {event['level']}: {event['message']}"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _EVENT_LEVEL_BRUSHES.get(event['level'])
+        return None
+    
+    def _matches(self, event: dict) -> bool:
+        """Verificar si un evento pasa los filtros activos"""
+        # Filtro de nivel
+        if self._level_filter != "Todos" and event['level'] != self._level_filter:
+            return False
+        
+        # Filtro de texto (mensaje en minúsculas precalculado al insertar)
+        if self._text_filter and self._text_filter not in event['_message_lower']:
+            return False
+        
+        return True
+    
+    def set_filters(self, level_filter: str, text_filter: str):
+        """
+        Cambiar los filtros y recalcular los eventos visibles
+        
+        Args:
+            level_filter: Nivel a mostrar ("Todos" para no filtrar)
+            text_filter: Texto a buscar en los mensajes
+        """
+        self.beginResetModel()
+        self._level_filter = level_filter
+        self._text_filter = text_filter.lower()
+        self._visible = deque(event for event in self._events if self._matches(event))
+        self.endResetModel()
+    
+    def append_event(self, event: dict):
+        """Agregar un evento, descartando el más antiguo si se alcanzó el máximo"""
+        if len(self._events) == self._events.maxlen:
+            # El descartado es el más antiguo: si está visible, es la fila 0
+            oldest = self._events[0]
+            if self._visible and self._visible[0] is oldest:
+                self.beginRemoveRows(QModelIndex(), 0, 0)
+                self._visible.popleft()
+                self.endRemoveRows()
+        
+        self._events.append(event)
+        
+        if self._matches(event):
+            row = len(self._visible)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._visible.append(event)
+            self.endInsertRows()
+    
+    def clear(self):
+        """Eliminar todos los eventos"""
+        self.beginResetModel()
+        self._events.clear()
+        self._visible.clear()
+        self.endResetModel()
+
 class EventLogViewer(QFrame):
     """
     Visor de log de eventos con filtros y búsqueda
     """
     
+    FILTER_DEBOUNCE_MS = 150
+    
     def __init__(self, max_entries: int = 1000, parent=None):
         super().__init__(parent)
         
         self.max_entries = max_entries
-        self.events = []  # Lista de eventos
-        self.filtered_events = []  # Eventos filtrados
+        self.event_model = EventLogModel(max_entries, self)
+        
+        # Agrupar las pulsaciones del filtro de texto en una sola pasada
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.apply_filters)
         
         self.setup_ui()
         self.setup_filters()
     
+    @property
+    def events(self) -> deque:
+        """Lista de eventos"""
+        return self.event_model.events
+    
+    @property
+    def filtered_events(self) -> deque:
+        """Eventos filtrados"""
+        return self.event_model.visible_events
+    
     def setup_ui(self):
         """Configurar interfaz"""
         layout = QVBoxLayout(self)
@@ -324,16 +669,23 @@ class EventLogViewer(QFrame):
         
         layout.addLayout(controls_layout)
         
-        # Lista de eventos
-        self.event_list = QListWidget()
-        self.event_list.setFont(QFont("Consolas", 9))
+        # Lista de eventos: la vista solo pinta las filas visibles
+        self.event_list = QListView()
+        self.event_list.setModel(self.event_model)
+        self.event_list.setUniformItemSizes(True)
+        # Tras un cambio de filtro las filas se distribuyen por lotes,
+        # intercalados con el procesamiento de eventos
+        self.event_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.event_list.setBatchSize(200)
+        self.event_list.setFont(_font("Consolas", 9))
+        self.event_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         self.event_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #f8f8f8;
                 border: 1px solid #cccccc;
                 alternate-background-color: #f0f0f0;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 2px;
                 border-bottom: 1px solid #eeeeee;
             }
@@ -343,7 +695,7 @@ class EventLogViewer(QFrame):
     def setup_filters(self):
         """Configurar filtros automáticos"""
         self.level_filter.currentTextChanged.connect(self.apply_filters)
-        self.text_filter.textChanged.connect(self.apply_filters)
+        self.text_filter.textChanged.connect(lambda _text: self._filter_timer.start())
     
     def add_event(self, level: str, message: str, timestamp: Optional[datetime] = None):
         """
@@ -355,98 +707,104 @@ class EventLogViewer(QFrame):
             timestamp: Timestamp (usar actual si no se especifica)
         """
         if timestamp is None:
-            timestamp = datetime.now()
+            timestamp = _now()
         
         event = {
             'level': level,
             'message': message,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            '_ts_str': timestamp.strftime("%H:%M:%S"),
+            '_message_lower': message.lower()
         }
         
-        self.events.append(event)
-        
-        # Limitar número de eventos
-        if len(self.events) > self.max_entries:
-            self.events = self.events[-self.max_entries:]
+        # Seguir el final solo si el usuario no se desplazó hacia arriba
+        scrollbar = self.event_list.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
         
-        self.apply_filters()
+        # El deque del modelo descarta el evento más antiguo al llenarse
+        self.event_model.append_event(event)
+        self.update_display(scroll_to_bottom=at_bottom)
     
     def apply_filters(self):
         """Aplicar filtros activos"""
-        level_filter = self.level_filter.currentText()
-        text_filter = self.text_filter.text().lower()
-        
-        # Filtrar eventos
-        self.filtered_events = []
-        
-        for event in self.events:
-            # Filtro de nivel
-            if level_filter != "Todos" and event['level'] != level_filter:
-                continue
-            
-            # Filtro de texto
-            if text_filter and text_filter not in event['message'].lower():
-                continue
-            
-            self.filtered_events.append(event)
-        
+        self._filter_timer.stop()
+        self.event_model.set_filters(self.level_filter.currentText(),
+                                     self.text_filter.text())
         self.update_display()
     
-    def update_display(self):
-        """Actualizar visualización de eventos"""
-        self.event_list.clear()
-        
-        for event in self.filtered_events:
-            timestamp_str = event['timestamp'].strftime("%H:%M:%S")
-            level = event['level']
-            message = event['message']
-            
-            # Formatear texto
-            item_text = f"[{timestamp_str}] {level}: {message}"
-            
-            item = QListWidgetItem(item_text)
-            
-            # Color según nivel
-            color_map = {
-                'INFO': QColor(0, 0, 0),
-                'WARNING': QColor(255, 140, 0),
-                'ERROR': QColor(255, 0, 0),
-                'SUCCESS': QColor(0, 128, 0)
-            }
-            
-            if level in color_map:
-                item.setForeground(color_map[level])
-            
-            self.event_list.addItem(item)
+    def update_display(self, scroll_to_bottom: bool = True):
+        """
+        Actualizar contador y desplazar al último evento
         
-        # Actualizar contador
+        Args:
+            scroll_to_bottom: Si desplazar la lista hasta el último evento
+        """
         self.event_counter.setText(f"Eventos: {len(self.filtered_events)}/{len(self.events)}")
         
         # Scroll al final
-        self.event_list.scrollToBottom()
+        if scroll_to_bottom:
+            self.event_list.scrollToBottom()
     
     def clear_events(self):
         """Limpiar todos los eventos"""
-        self.events.clear()
-        self.filtered_events.clear()
+        self.event_model.clear()
         self.update_display()
 
 class ConfigurationDialog(QDialog):
     """
     Diálogo genérico de configuración
+    
+    Las configuraciones pueden agregarse con los métodos add_*_setting o
+    describirse en un esquema; en ese caso los widgets se crean recién
+    cuando el diálogo se muestra por primera vez.
     """
     
-    def __init__(self, title: str = "Configuración", parent=None):
+    def __init__(self, title: str = "Configuración", parent=None,
+                 schema: Optional[List[tuple]] = None):
+        """
+        Args:
+            title: Título del diálogo
+            parent: Widget padre
+            schema: Lista de (tipo, clave, etiqueta, kwargs) con tipo en
+                'string', 'integer', 'boolean' o 'choice' (opcional)
+        """
         super().__init__(parent)
         
         self.setWindowTitle(title)
         self.setModal(True)
         self.resize(400, 300)
         
-        self.config_items = {}  # Dict[str, QWidget]
+        self.config_items = {}  # Dict[str, (QWidget, getter, setter)]
+        
+        # Esquema pendiente de construir y valores a aplicar al construirlo
+        self._schema = list(schema) if schema else []
+        self._pending_values: Dict[str, Any] = {}
         
         self.setup_ui()
     
+    def showEvent(self, event):
+        """Construir los widgets del esquema al mostrarse por primera vez"""
+        self._build_schema()
+        super().showEvent(event)
+    
+    def _build_schema(self):
+        """Crear los widgets del esquema pendiente (una sola vez)"""
+        if not self._schema:
+            return
+        
+        adders = {
+            'string': self.add_string_setting,
+            'integer': self.add_integer_setting,
+            'boolean': self.add_boolean_setting,
+            'choice': self.add_choice_setting,
+        }
+        schema, self._schema = self._schema, []
+        for kind, key, label, kwargs in schema:
+            adders[kind](key, label, **kwargs)
+        
+        pending, self._pending_values = self._pending_values, {}
+        self.set_values(pending)
+    
     def setup_ui(self):
         """Configurar interfaz"""
         layout = QVBoxLayout(self)
@@ -479,7 +837,8 @@ class ConfigurationDialog(QDialog):
         self.config_layout.addWidget(label_widget, row, 0)
         self.config_layout.addWidget(line_edit, row, 1)
         
-        self.config_items[key] = line_edit
+        self.config_items[key] = (line_edit, QLineEdit.text,
+                                  lambda widget, value: widget.setText(str(value)))
     
     def add_integer_setting(self, key: str, label: str, default_value: int = 0, 
                            min_value: int = 0, max_value: int = 999999):
@@ -494,7 +853,8 @@ class ConfigurationDialog(QDialog):
         self.config_layout.addWidget(label_widget, row, 0)
         self.config_layout.addWidget(spin_box, row, 1)
         
-        self.config_items[key] = spin_box
+        self.config_items[key] = (spin_box, QSpinBox.value,
+                                  lambda widget, value: widget.setValue(int(value)))
     
     def add_boolean_setting(self, key: str, label: str, default_value: bool = False):
         """Agregar configuración booleana"""
@@ -505,7 +865,8 @@ class ConfigurationDialog(QDialog):
         
         self.config_layout.addWidget(checkbox, row, 0, 1, 2)
         
-        self.config_items[key] = checkbox
+        self.config_items[key] = (checkbox, QCheckBox.isChecked,
+                                  lambda widget, value: widget.setChecked(bool(value)))
     
     def add_choice_setting(self, key: str, label: str, choices: List[str], default_index: int = 0):
         """Agregar configuración de selección"""
@@ -519,51 +880,45 @@ class ConfigurationDialog(QDialog):
         self.config_layout.addWidget(label_widget, row, 0)
         self.config_layout.addWidget(combo_box, row, 1)
         
-        self.config_items[key] = combo_box
+        self.config_items[key] = (combo_box, QComboBox.currentText, self._set_combo_text)
     
     def get_values(self) -> Dict[str, Any]:
         """Obtener valores de configuración"""
-        values = {}
-        
-        for key, widget in self.config_items.items():
-            if isinstance(widget, QLineEdit):
-                values[key] = widget.text()
-            elif isinstance(widget, QSpinBox):
-                values[key] = widget.value()
-            elif isinstance(widget, QCheckBox):
-                values[key] = widget.isChecked()
-            elif isinstance(widget, QComboBox):
-                values[key] = widget.currentText()
-        
-        return values
+        self._build_schema()
+        return {key: getter(widget)
+                for key, (widget, getter, _setter) in self.config_items.items()}
     
     def set_values(self, values: Dict[str, Any]):
         """Establecer valores de configuración"""
+        if self._schema:
+            # Widgets aún sin construir: aplicar al mostrarse
+            self._pending_values.update(values)
+            return
+        
         for key, value in values.items():
             if key in self.config_items:
-                widget = self.config_items[key]
-                
-                if isinstance(widget, QLineEdit):
-                    widget.setText(str(value))
-                elif isinstance(widget, QSpinBox):
-                    widget.setValue(int(value))
-                elif isinstance(widget, QCheckBox):
-                    widget.setChecked(bool(value))
-                elif isinstance(widget, QComboBox):
-                    index = widget.findText(str(value))
-                    if index >= 0:
-                        widget.setCurrentIndex(index)
+                widget, _getter, setter = self.config_items[key]
+                setter(widget, value)
+    
+    @staticmethod
+    def _set_combo_text(combo_box: QComboBox, value: Any):
+        """Seleccionar la opción con el texto dado (si existe)"""
+        index = combo_box.findText(str(value))
+        if index >= 0:
+            combo_box.setCurrentIndex(index)
 
 class ProgressIndicator(QFrame):
     """
     Indicador de progreso con animación
     """
     
+    ANIMATION_INTERVAL_MS = 200
+    
     def __init__(self, text: str = "Procesando...", parent=None):
         super().__init__(parent)
         
-        self.animation_group = None
         self.progress_dots = []
+        self._active_dot = -1
         
         self.setup_ui(text)
         self.setup_animation()
@@ -586,11 +941,10 @@ class ProgressIndicator(QFrame):
         self.text_label = QLabel(text)
         layout.addWidget(self.text_label)
         
-        # Puntos animados
+        # Puntos animados (el color se cambia por paleta, ver setup_animation)
         for i in range(3):
             dot = QLabel("●")
-            dot.setFont(QFont("Arial", 12))
-            dot.setStyleSheet("color: #666666;")
+            dot.setFont(_font("Arial", 12))
             layout.addWidget(dot)
             self.progress_dots.append(dot)
         
@@ -598,28 +952,35 @@ class ProgressIndicator(QFrame):
     
     def setup_animation(self):
         """Configurar animación de puntos"""
-        self.animation_group = QSequentialAnimationGroup()
-        
-        for i, dot in enumerate(self.progress_dots):
-            # Animación de fade in/out para cada punto
-            animation = QPropertyAnimation(dot, b"styleSheet")
-            animation.setDuration(200)
-            animation.setStartValue("color: #666666;")
-            animation.setEndValue("color: #000000;")
-            
-            self.animation_group.addAnimation(animation)
-        
-        self.animation_group.setLoopCount(-1)  # Loop infinito
+        # Dos paletas precalculadas: apagado (gris) y encendido (negro).
+        # Cambiar de paleta no reparsea ninguna hoja de estilos
+        self._palette_off = QPalette(self.progress_dots[0].palette())
+        self._palette_off.setColor(QPalette.ColorRole.WindowText, QColor("#666666"))
+        self._palette_on = QPalette(self._palette_off)
+        self._palette_on.setColor(QPalette.ColorRole.WindowText, QColor("#000000"))
+        
+        for dot in self.progress_dots:
+            dot.setPalette(self._palette_off)
+        
+        # Un solo timer enciende los puntos de a uno, en ciclo
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setInterval(self.ANIMATION_INTERVAL_MS)
+        self.animation_timer.timeout.connect(self._advance_animation)
+    
+    def _advance_animation(self):
+        """Encender el siguiente punto y apagar el anterior"""
+        if self._active_dot >= 0:
+            self.progress_dots[self._active_dot].setPalette(self._palette_off)
+        self._active_dot = (self._active_dot + 1) % len(self.progress_dots)
+        self.progress_dots[self._active_dot].setPalette(self._palette_on)
     
     def start_animation(self):
         """Iniciar animación"""
-        if self.animation_group:
-            self.animation_group.start()
+        self.animation_timer.start()
     
     def stop_animation(self):
         """Detener animación"""
-        if self.animation_group:
-            self.animation_group.stop()
+        self.animation_timer.stop()
     
     def set_text(self, text: str):
         """Cambiar texto mostrado"""
@@ -630,17 +991,21 @@ class StatisticsWidget(QGroupBox):
     Widget de estadísticas con actualización automática
     """
     
+    # A partir de cuántos valores conviene formatear con numpy
+    BATCH_NUMPY_THRESHOLD = 20
+    
     def __init__(self, title: str = "Estadísticas", parent=None):
         super().__init__(title, parent)
         
         self.statistics = {}  # Dict[str, Any]
         self.stat_labels = {}  # Dict[str, QLabel]
+        self._dirty = set()  # Claves con valor pendiente de mostrar
         
         self.setup_ui()
         
         # Timer para actualización automática
         self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_display)
+        self.update_timer.timeout.connect(self._on_update_timer)
         self.update_timer.start(5000)  # Actualizar cada 5 segundos
     
     def setup_ui(self):
@@ -671,26 +1036,74 @@ class StatisticsWidget(QGroupBox):
             'value': initial_value,
             'format_func': format_func
         }
+        # El valor inicial se muestra formateado en el próximo refresco
+        self._dirty.add(key)
     
     def update_statistic(self, key: str, value: Any):
         """Actualizar valor de estadística"""
         if key in self.statistics:
             self.statistics[key]['value'] = value
+            self._dirty.add(key)
+            self.update_display()
+    
+    def update_statistics_batch(self, values: Dict[str, float], fmt: str = "%.2f"):
+        """
+        Actualizar varias estadísticas numéricas con un formato común
+        
+        Con muchas estadísticas el formateo se hace en un solo recorrido
+        vectorizado (numpy.char.mod) en lugar de una llamada por valor.
+        El format_func de cada estadística no se usa en este camino.
+        
+        Args:
+            values: Clave -> valor numérico
+            fmt: Formato estilo printf aplicado a todos los valores
+        """
+        keys = [key for key in values if key in self.statistics]
+        if not keys:
+            return
+        
+        if len(keys) >= self.BATCH_NUMPY_THRESHOLD:
+            import numpy as np
+            
+            array = np.fromiter((values[key] for key in keys), dtype=np.float64, count=len(keys))
+            texts = np.char.mod(fmt, array).tolist()
+        else:
+            texts = [fmt % values[key] for key in keys]
+        
+        for key, text in zip(keys, texts):
+            self.statistics[key]['value'] = values[key]
+            self._dirty.discard(key)
+            
+            label = self.stat_labels.get(key)
+            if label is not None and label.text() != text:
+                label.setText(text)
+    
+    def _on_update_timer(self):
+        """Refresco periódico: solo si hay valores pendientes"""
+        if self._dirty:
             self.update_display()
     
     def update_display(self):
-        """Actualizar visualización de estadísticas"""
-        for key, stat_data in self.statistics.items():
-            if key in self.stat_labels:
-                value = stat_data['value']
-                format_func = stat_data['format_func']
-                
-                if format_func:
-                    formatted_value = format_func(value)
-                else:
-                    formatted_value = str(value)
-                
-                self.stat_labels[key].setText(formatted_value)
+        """Actualizar visualización de las estadísticas modificadas"""
+        dirty, self._dirty = self._dirty, set()
+        
+        for key in dirty:
+            label = self.stat_labels.get(key)
+            if label is None:
+                continue
+            
+            stat_data = self.statistics[key]
+            value = stat_data['value']
+            format_func = stat_data['format_func']
+            
+            if format_func:
+                formatted_value = format_func(value)
+            else:
+                formatted_value = str(value)
+            
+            # setText con el mismo texto igual revisa el layout: evitarlo
+            if formatted_value != label.text():
+                label.setText(formatted_value)
 
 # Funciones de utilidad para crear widgets comunes
 def create_module_status_widget(module_id: int, module_name: str) -> QFrame:
@@ -741,13 +1154,16 @@ def show_configuration_dialog(parent=None, title: str = "Configuración",
     Returns:
         Diccionario con nuevas configuraciones o None si se canceló
     """
-    dialog = ConfigurationDialog(title, parent)
-    
-    # Agregar configuraciones comunes
-    dialog.add_string_setting('serial_port', 'Puerto Serie', 'COM1')
-    dialog.add_integer_setting('baud_rate', 'Velocidad (baud)', 9600, 1200, 115200)
-    dialog.add_integer_setting('polling_interval', 'Intervalo Polling (ms)', 1000, 100, 10000)
-    dialog.add_boolean_setting('auto_start', 'Iniciar automáticamente', True)
+    # Configuraciones comunes (los widgets se crean al mostrar el diálogo)
+    schema = [
+        ('string', 'serial_port', 'Puerto Serie', {'default_value': 'COM1'}),
+        ('integer', 'baud_rate', 'Velocidad (baud)',
+         {'default_value': 9600, 'min_value': 1200, 'max_value': 115200}),
+        ('integer', 'polling_interval', 'Intervalo Polling (ms)',
+         {'default_value': 1000, 'min_value': 100, 'max_value': 10000}),
+        ('boolean', 'auto_start', 'Iniciar automáticamente', {'default_value': True}),
+    ]
+    dialog = ConfigurationDialog(title, parent, schema=schema)
     
     if settings:
         dialog.set_values(settings)
@@ -4,12 +4,29 @@
 Funciones auxiliares adicionales para el sistema
 """
 import os
+import re
+import time
+import ipaddress
 import platform
 import psutil
-from datetime import datetime, timedelta
+from functools import lru_cache
+from datetime import datetime
 from typing import Optional, Dict, Any
 from pathlib import Path
+from types import MappingProxyType
 
+# Bytes por GB
+_GB = 1024 ** 3
+
+# Unidades de format_file_size (potencias de 1024)
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Tabla de str.translate que borra los caracteres ASCII no alfanuméricos
+_ASCII_NON_ALNUM = {code: None for code in range(128) if not chr(code).isalnum()}
+
+# Tramos de caracteres no alfanuméricos en Unicode: \W excluye lo mismo que
+# str.isalnum salvo el guión bajo, que se agrega aparte
+_NON_ALNUM_RE = re.compile(r'[\W_]+')
 
 def format_identification(identification: str) -> str:
     """
@@ -24,8 +41,11 @@ def format_identification(identification: str) -> str:
     if not identification:
         return ""
     
-    # Remover espacios y caracteres especiales
-    clean_id = ''.join(filter(str.isalnum, identification))
+    # Remover espacios y caracteres especiales (en C para el caso ASCII)
+    if identification.isascii():
+        clean_id = identification.translate(_ASCII_NON_ALNUM)
+    else:
+        clean_id = _NON_ALNUM_RE.sub('', identification)
     
     # Agregar ceros a la izquierda si es necesario (longitud estándar: 8)
     return clean_id.zfill(8)
@@ -56,6 +76,58 @@ def validate_datetime_range(start_date: datetime, end_date: datetime) -> bool:
     return True
 
 
+def validate_datetime_ranges(start_dates, end_dates):
+    """
+    Validar muchos rangos de fechas a la vez (versión vectorizada)
+    
+    Mismas reglas que validate_datetime_range, evaluadas con numpy sobre
+    los enteros de datetime64[us] en lugar de comparar datetime por fila
+    (resolución de microsegundos, la misma de datetime).
+    Las fechas faltantes (None/NaT) invalidan el rango.
+    
+    Args:
+        start_dates: Secuencia o array de fechas de inicio
+        end_dates: Secuencia o array de fechas de fin
+        
+    Returns:
+        numpy.ndarray: Array booleano, True donde el rango es válido
+    """
+    import numpy as np
+    
+    starts = np.asarray(start_dates, dtype='datetime64[us]').view('i8')
+    ends = np.asarray(end_dates, dtype='datetime64[us]').view('i8')
+    nat = np.iinfo(np.int64).min  # NaT como entero
+    
+    # Diferencia en microsegundos: >= 0 y menos de 366 días, como
+    # (end_date - start_date).days <= 365
+    delta = ends - starts
+    return ((starts != nat) & (ends != nat) &
+            (delta >= 0) & (delta < 366 * 86400 * 10**6))
+
+
+@lru_cache(maxsize=1)
+def _static_system_info() -> MappingProxyType:
+    """
+    Datos de plataforma, constantes durante la vida del proceso
+    
+    Se obtienen una sola vez: algunas llamadas de platform leen archivos o
+    lanzan subprocesos (p.ej. processor()).
+    
+    Returns:
+        MappingProxyType: Vista de solo lectura de los datos
+    """
+    return MappingProxyType({
+        'platform': platform.platform(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'version': platform.version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python_version': platform.python_version(),
+        'cpu_count': psutil.cpu_count(),
+    })
+
+
 def get_system_info() -> Dict[str, Any]:
     """
     Obtener información del sistema
@@ -64,23 +136,21 @@ def get_system_info() -> Dict[str, Any]:
         Dict[str, Any]: Información del sistema
     """
     try:
-        return {
-            'platform': platform.platform(),
-            'system': platform.system(),
-            'release': platform.release(),
-            'version': platform.version(),
-            'machine': platform.machine(),
-            'processor': platform.processor(),
-            'python_version': platform.python_version(),
-            'cpu_count': psutil.cpu_count(),
-            'memory_total_gb': round(psutil.virtual_memory().total / (1024**3), 2),
+        # Una sola consulta de memoria y disco por llamada
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        
+        info = dict(_static_system_info())
+        info.update({
+            'memory_total_gb': round(memory.total / _GB, 2),
             'disk_usage': {
-                'total_gb': round(psutil.disk_usage('/').total / (1024**3), 2),
-                'free_gb': round(psutil.disk_usage('/').free / (1024**3), 2),
-                'used_percent': psutil.disk_usage('/').percent
+                'total_gb': round(disk.total / _GB, 2),
+                'free_gb': round(disk.free / _GB, 2),
+                'used_percent': disk.percent
             },
             'timestamp': datetime.now().isoformat()
-        }
+        })
+        return info
     except Exception as e:
         return {'error': str(e), 'timestamp': datetime.now().isoformat()}
 
@@ -100,15 +170,28 @@ def cleanup_temp_directory(directory: Path, max_age_days: int = 7) -> int:
         return 0
     
     try:
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
+        # Comparar st_mtime crudo contra un corte en segundos Unix
+        cutoff = time.time() - max_age_days * 86400
         deleted_count = 0
         
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                if file_mtime < cutoff_date:
-                    file_path.unlink()
-                    deleted_count += 1
+        # Recorrido iterativo con os.scandir: reutiliza los metadatos de
+        # cada entrada y evita crear objetos Path por archivo
+        pending = [os.fspath(directory)]
+        unlink = os.unlink
+        while pending:
+            expired = []
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                            expired.append(entry.path)
+            
+            # Borrar en lote por directorio, con el listado ya cerrado
+            for path in expired:
+                unlink(path)
+            deleted_count += len(expired)
         
         return deleted_count
         
@@ -128,14 +211,39 @@ def validate_ip_address(ip: str) -> bool:
     Returns:
         bool: True si es válida
     """
+    # Camino rápido para IPv4 decimal con puntos, el caso habitual
+    if isinstance(ip, str) and ip.count('.') == 3 and ':' not in ip:
+        for part in ip.split('.'):
+            # Mismas reglas que ipaddress: 1-3 dígitos ASCII, sin ceros a la izquierda
+            if (not part or len(part) > 3 or not part.isascii() or not part.isdigit()
+                    or (part[0] == '0' and len(part) > 1) or int(part) > 255):
+                return False
+        return True
+    
     try:
-        import ipaddress
         ipaddress.ip_address(ip)
         return True
     except ValueError:
         return False
 
 
+def has_network_interface() -> bool:
+    """
+    Verificar si existe alguna interfaz de red activa (excluyendo loopback)
+    
+    Returns:
+        bool: True si hay al menos una interfaz activa
+    """
+    try:
+        return any(
+            stats.isup and name != 'lo' and not name.lower().startswith('loopback')
+            for name, stats in psutil.net_if_stats().items()
+        )
+    except Exception:
+        # Ante la duda, no bloquear las operaciones de red
+        return True
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Formatear tamaño de archivo en formato legible
@@ -149,15 +257,13 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    units = ["B", "KB", "MB", "GB", "TB"]
-    size = float(size_bytes)
-    unit_index = 0
-    
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
+    # Índice de unidad = log1024 del tamaño, tomado de la longitud en bits
+    if size_bytes >= 1024:
+        unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    else:
+        unit_index = 0
     
-    return f"{size:.1f} {units[unit_index]}"
+    return f"{size_bytes / (1 << (unit_index * 10)):.1f} {_SIZE_UNITS[unit_index]}"
 
 
 def create_backup_filename(original_filename: str, backup_dir: Path) -> Path:
@@ -171,8 +277,8 @@ def create_backup_filename(original_filename: str, backup_dir: Path) -> Path:
     Returns:
         Path: Ruta completa del backup
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    name_parts = Path(original_filename).stem, timestamp, Path(original_filename).suffix
-    backup_filename = f"{name_parts[0]}_backup_{name_parts[1]}{name_parts[2]}"
+    original = Path(original_filename)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    backup_filename = f"{original.stem}_backup_{timestamp}{original.suffix}"
     
     return backup_dir / backup_filename
\ No newline at end of file
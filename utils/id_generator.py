@@ -3,10 +3,32 @@
 Generador de IDs únicos para el sistema WPC
 Reemplaza las funciones de generación de IDs de VB6
 """
-from datetime import datetime, date, timedelta, time as dt_time
+from datetime import datetime, date, timedelta
 import time as pytime
 from typing import Dict, Any
 
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
+
+# Desfase UTC -> hora local, recalculado cada 15 minutos (los cambios de
+# horario ocurren en esos límites): (bloque, desfase en ns)
+_UTC_OFFSET_BLOCK_SECONDS = 900
+_utc_offset_cache = (None, 0)
+
+def _local_time_ns() -> int:
+    """Nanosegundos desde la época Unix expresados en hora local"""
+    global _utc_offset_cache
+    ns = pytime.time_ns()
+    seconds = ns // _NS_PER_SECOND
+    block = seconds // _UTC_OFFSET_BLOCK_SECONDS
+    
+    cached_block, offset_ns = _utc_offset_cache
+    if block != cached_block:
+        offset_ns = pytime.localtime(seconds).tm_gmtoff * _NS_PER_SECOND
+        _utc_offset_cache = (block, offset_ns)
+    
+    return ns + offset_ns
+
 class IDGenerator:
     """
     Generador de IDs únicos compatible con el sistema VB6
@@ -15,6 +37,19 @@ class IDGenerator:
     
     # Fecha base para cálculos (según documentación VB6)
     BASE_DATE = date(2007, 6, 1)
+    _BASE_DATETIME = datetime(2007, 6, 1)
+    _BASE_EPOCH_DAYS = (BASE_DATE - date(1970, 1, 1)).days
+    
+    # Límites de un ID de movimiento válido (ver validate_id_format)
+    _MS_PER_DAY = 86400000
+    _MAX_DAYS_FROM_BASE = (date.max - BASE_DATE).days
+    
+    # Offset de cada tipo de ID respecto del ID de movimiento
+    _ID_OFFSETS = {
+        "movement": 0,
+        "ticket": 50000000,
+        "identification": 25000000,
+    }
     
     @classmethod
     def generate_movement_id(cls) -> int:
@@ -27,18 +62,12 @@ class IDGenerator:
         Returns:
             int: ID único para movimiento
         """
-        current_date = datetime.now()
+        # Aritmética entera sobre la hora local, sin construir un datetime
+        days_since_epoch, ns_today = divmod(_local_time_ns(), _NS_PER_DAY)
         
-        # Calcular días desde fecha base
-        days_diff = (current_date.date() - cls.BASE_DATE).days
-        
-        # Calcular milisegundos del día actual
-        milliseconds_today = (
-            current_date.hour * 3600000 +
-            current_date.minute * 60000 +
-            current_date.second * 1000 +
-            current_date.microsecond // 1000
-        )
+        # Días desde fecha base y milisegundos del día actual
+        days_diff = days_since_epoch - cls._BASE_EPOCH_DAYS
+        milliseconds_today = ns_today // 1_000_000
         
         return days_diff * 100000000 + milliseconds_today
     
@@ -62,7 +91,7 @@ class IDGenerator:
         Returns:
             int: ID único para persona
         """
-        return int(pytime.time() * 1000) % 1000000000  # Últimos 9 dígitos
+        return (pytime.time_ns() // 1_000_000) % 1000000000  # Últimos 9 dígitos
     
     @classmethod
     def generate_identification_id(cls) -> int:
@@ -89,26 +118,29 @@ class IDGenerator:
             days_from_base = movement_id // 100000000
             milliseconds_today = movement_id % 100000000
             
-            # Calcular fecha
-            target_date = cls.BASE_DATE + timedelta(days=days_from_base)
+            # La parte horaria no puede pasar de un día completo
+            if milliseconds_today >= cls._MS_PER_DAY:
+                raise ValueError(
+                    f"milisegundos del día fuera de rango: {milliseconds_today}"
+                )
+            
+            # Fecha y hora en una sola suma sobre la fecha base
+            moment = cls._BASE_DATETIME + timedelta(
+                days=days_from_base, milliseconds=milliseconds_today
+            )
             
             # Calcular hora del día
-            total_seconds = milliseconds_today // 1000
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            milliseconds = milliseconds_today % 1000
+            total_seconds, milliseconds = divmod(milliseconds_today, 1000)
+            hours, remainder = divmod(total_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
             
             return {
-                'date': target_date,
+                'date': moment.date(),
                 'hours': hours,
                 'minutes': minutes,
                 'seconds': seconds,
                 'milliseconds': milliseconds,
-                'datetime': datetime.combine(
-                    target_date, 
-                    dt_time(hours, minutes, seconds, milliseconds * 1000)
-                )
+                'datetime': moment
             }
             
         except Exception as e:
@@ -117,6 +149,43 @@ class IDGenerator:
                 'valid': False
             }
     
+    @classmethod
+    def parse_movement_ids(cls, movement_ids) -> Dict[str, Any]:
+        """
+        Parsear muchos IDs de movimiento a la vez (p.ej. importaciones)
+        
+        Versión vectorizada de parse_movement_id: solo aritmética entera
+        sobre arrays int64, sin construir un datetime por registro.
+        
+        Args:
+            movement_ids: Secuencia o array de IDs de movimiento
+            
+        Returns:
+            dict: Arrays 'days', 'hours', 'minutes', 'seconds',
+                'milliseconds' y 'datetime' (datetime64[ms])
+        """
+        import numpy as np
+        
+        ids = np.asarray(movement_ids, dtype=np.int64)
+        days_from_base, milliseconds_today = np.divmod(ids, 100000000)
+        total_seconds, milliseconds = np.divmod(milliseconds_today, 1000)
+        hours, remainder = np.divmod(total_seconds, 3600)
+        minutes, seconds = np.divmod(remainder, 60)
+        
+        base = np.datetime64(cls.BASE_DATE, 'ms')
+        datetimes = (base
+                     + days_from_base.astype('timedelta64[D]')
+                     + milliseconds_today.astype('timedelta64[ms]'))
+        
+        return {
+            'days': days_from_base,
+            'hours': hours,
+            'minutes': minutes,
+            'seconds': seconds,
+            'milliseconds': milliseconds,
+            'datetime': datetimes
+        }
+    
     @classmethod
     def validate_id_format(cls, id_value: int, id_type: str = "movement") -> bool:
         """
@@ -129,34 +198,26 @@ class IDGenerator:
         Returns:
             bool: True si el formato es válido
         """
-        try:
-            if id_type == "movement":
-                # Los IDs de movimiento deben ser positivos y tener formato específico
-                if id_value <= 0:
-                    return False
-                
-                parsed = cls.parse_movement_id(id_value)
-                return 'error' not in parsed
-                
-            elif id_type == "ticket":
-                # Los tickets tienen offset de 50M
-                base_id = id_value - 50000000
-                return cls.validate_id_format(base_id, "movement")
-                
-            elif id_type == "identification":
-                # Las identificaciones tienen offset de 25M
-                base_id = id_value - 25000000
-                return cls.validate_id_format(base_id, "movement")
-                
-            elif id_type == "person":
-                # IDs de persona deben ser positivos y razonables
+        if id_type == "person":
+            # IDs de persona deben ser positivos y razonables
+            try:
                 return 0 < id_value < 10000000000
-                
-            else:
+            except TypeError:
                 return False
-                
-        except Exception:
+        
+        # Movimientos y derivados: validar la fórmula de generate_movement_id
+        # con aritmética entera, sin parsear ni construir un datetime
+        offset = cls._ID_OFFSETS.get(id_type)
+        if offset is None or not isinstance(id_value, int):
             return False
+        
+        base_id = id_value - offset
+        if base_id <= 0:
+            return False
+        
+        days_from_base, milliseconds_today = divmod(base_id, 100000000)
+        return (milliseconds_today < cls._MS_PER_DAY and
+                days_from_base <= cls._MAX_DAYS_FROM_BASE)
 
 # Funciones de conveniencia para uso directo
 def new_movement_id() -> int:
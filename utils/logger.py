@@ -3,25 +3,97 @@
 Sistema de logging para WPC
 Reemplaza mdlmensajes.bas de VB6
 """
+import atexit
 import logging
 import logging.handlers
+import threading
+from queue import SimpleQueue
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from config.settings import settings
 
+# Niveles de logging por nombre, resueltos una sola vez (incluye los alias
+# WARN y FATAL que acepta el módulo logging)
+_LEVELS = {name: getattr(logging, name)
+           for name in ('DEBUG', 'INFO', 'WARNING', 'WARN', 'ERROR',
+                        'CRITICAL', 'FATAL')}
+
+def _configured_level() -> int:
+    """
+    Nivel de settings.LOG_LEVEL, sin distinguir mayúsculas
+    
+    Returns:
+        int: Nivel de logging
+        
+    Raises:
+        ValueError: Si LOG_LEVEL no es un nivel válido
+    """
+    name = str(settings.LOG_LEVEL).strip().upper()
+    try:
+        return _LEVELS[name]
+    except KeyError:
+        raise ValueError(
+            f"LOG_LEVEL inválido: {settings.LOG_LEVEL!r} "
+            f"(valores válidos: {', '.join(_LEVELS)})"
+        ) from None
+
+@lru_cache(maxsize=1)
+def _qt_dialog_classes():
+    """
+    (QMessageBox, QApplication) si PyQt6 está disponible, None si no
+    
+    Se resuelve una sola vez por proceso.
+    """
+    try:
+        from PyQt6.QtWidgets import QMessageBox, QApplication
+    except ImportError:
+        return None
+    return QMessageBox, QApplication
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter que reutiliza la marca de tiempo del último segundo
+    
+    El formato de fecha no incluye milisegundos, así que todos los registros
+    de un mismo segundo comparten el texto de strftime.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_text = self._last_time
+        if second != cached_second:
+            cached_text = super().formatTime(record, datefmt)
+            self._last_time = (second, cached_text)
+        return cached_text
+
 class WPCLogger:
     """
     Gestor de logging del sistema WPC
     Equivalente a las funciones de mdlmensajes.bas
     """
     
+    __slots__ = ('_logger', '_comm_logger', '_movement_logger', '_listener')
+    
     _instance: Optional['WPCLogger'] = None
-    _logger: Optional[logging.Logger] = None
+    _instance_lock = threading.Lock()
     
     def __new__(cls):
+        # Doble verificación: el lock solo se toma mientras no hay instancia
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._logger = None
+                    instance._comm_logger = None
+                    instance._movement_logger = None
+                    instance._listener = None
+                    cls._instance = instance
         return cls._instance
     
     def setup(self) -> logging.Logger:
@@ -32,25 +104,35 @@ class WPCLogger:
         if self._logger is not None:
             return self._logger
         
-        # Crear logger principal
+        # Crear logger principal y los específicos (se guardan para no
+        # buscarlos en cada mensaje)
+        log_level = _configured_level()
         self._logger = logging.getLogger('wpc')
-        self._logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+        self._logger.setLevel(log_level)
+        self._comm_logger = self._logger.getChild('communication')
+        self._movement_logger = self._logger.getChild('movements')
         
         # Evitar duplicación de handlers
         if self._logger.handlers:
             return self._logger
         
         # Formatter para logs
-        formatter = logging.Formatter(
+        formatter = _CachedTimeFormatter(
             fmt='%(asctime)s | %(levelname)-8s | %(name)-15s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
+        # El logger solo encola los registros; un hilo de fondo los escribe
+        # en consola y archivo, sin E/S en el hilo que registra
+        log_queue = SimpleQueue()
+        self._logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        handlers = []
+        
         # Handler para consola
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        self._logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # Handler para archivo con rotación
         if settings.LOG_FILE:
@@ -64,15 +146,28 @@ class WPCLogger:
                     backupCount=5,
                     encoding='utf-8'
                 )
-                file_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
+                file_handler.setLevel(log_level)
                 file_handler.setFormatter(formatter)
-                self._logger.addHandler(file_handler)
+                handlers.append(file_handler)
                 
             except Exception as e:
                 self._logger.warning(f"No se pudo configurar logging a archivo: {e}")
         
+        # Los registros encolados hasta aquí se escriben al arrancar el hilo
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+        
         return self._logger
     
+    def shutdown(self):
+        """Vaciar la cola de logging y detener el hilo escritor"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
     def log_system_message(self, message: str, level: str = "INFO", 
                           to_file: bool = True, show_dialog: bool = False):
         """
@@ -85,26 +180,22 @@ class WPCLogger:
             to_file: Si escribir a archivo (equivale al parámetro VB6)
             show_dialog: Si mostrar diálogo (equivale al parámetro VB6)
         """
-        if not self._logger:
-            self.setup()
-        
         # Registrar en log
-        log_level = getattr(logging, level.upper(), logging.INFO)
-        self._logger.log(log_level, message)
+        if not level.isupper():
+            level = level.upper()
+        self._logger.log(_LEVELS.get(level, logging.INFO), message)
         
         # Mostrar diálogo si se requiere (para errores críticos)
-        if show_dialog and level.upper() in ['ERROR', 'CRITICAL']:
-            try:
-                # Solo si hay interfaz gráfica disponible
-                from PyQt6.QtWidgets import QMessageBox, QApplication
+        if show_dialog and level in ('ERROR', 'CRITICAL'):
+            # Solo si hay interfaz gráfica disponible (si no, solo log)
+            qt_classes = _qt_dialog_classes()
+            if qt_classes is not None:
+                QMessageBox, QApplication = qt_classes
                 if QApplication.instance():
-                    if level.upper() == 'CRITICAL':
+                    if level == 'CRITICAL':
                         QMessageBox.critical(None, "Error Crítico", message)
                     else:
                         QMessageBox.warning(None, "Advertencia", message)
-            except ImportError:
-                # No hay GUI disponible, solo log
-                pass
     
     def log_communication(self, direction: str, module_id: int, 
                          command: str, response: str = ""):
@@ -118,44 +209,40 @@ class WPCLogger:
             command: Comando enviado
             response: Respuesta recibida (si aplica)
         """
-        if not self._logger:
-            self.setup()
+        comm_logger = self._comm_logger
         
-        comm_logger = logging.getLogger('wpc.communication')
+        # Se llama por cada trama: sin DEBUG habilitado no armar el mensaje
+        if not comm_logger.isEnabledFor(logging.DEBUG):
+            return
         
         if direction == 'TX':
-            comm_logger.debug(f"TX -> Módulo {module_id}: {command}")
+            comm_logger.debug("TX -> Módulo %s: %s", module_id, command)
         elif direction == 'RX':
-            comm_logger.debug(f"RX <- Módulo {module_id}: {response}")
+            comm_logger.debug("RX <- Módulo %s: %s", module_id, response)
         else:
-            comm_logger.debug(f"{direction} | Módulo {module_id}: {command} -> {response}")
+            comm_logger.debug("%s | Módulo %s: %s -> %s", direction, module_id, command, response)
     
     def log_movement(self, movement_id: int, module_id: int, 
                     identification: str, result: str):
         """
         Registrar evento de movimiento
         """
-        if not self._logger:
-            self.setup()
-        
-        movement_logger = logging.getLogger('wpc.movements')
-        movement_logger.info(
-            f"Movimiento {movement_id}: Módulo {module_id}, "
-            f"ID {identification}, Resultado: {result}"
+        self._movement_logger.info(
+            "Movimiento %s: Módulo %s, ID %s, Resultado: %s",
+            movement_id, module_id, identification, result
         )
     
     def log_error(self, error: Exception, context: str = ""):
         """
         Registrar error con contexto
         """
-        if not self._logger:
-            self.setup()
-        
         error_msg = f"Error en {context}: {str(error)}" if context else str(error)
         self._logger.error(error_msg, exc_info=True)
 
-# Instancia global del logger
+# Instancia global del logger, configurada al importar el módulo: los
+# métodos de logging no necesitan verificar la configuración en cada llamada
 wpc_logger = WPCLogger()
+wpc_logger.setup()
 
 def setup_logging() -> logging.Logger:
     """